@@ -18,10 +18,11 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from sqlalchemy import create_engine, func, desc, text
+from sqlalchemy import func, desc, select, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError, ProgrammingError
 
+from database.engine import create_pooled_engine
 from database.models import Base, Profile, ProfileHistory, Post, PostHistory, AlertLog, SubredditTraffic
 from services.logger import get_logger, setup_root_logger
 
@@ -289,7 +290,7 @@ def get_database_engine():
     sql_echo = os.getenv("SQL_ECHO", "false").lower() == "true"
     
     try:
-        engine = create_engine(database_url, pool_pre_ping=True, echo=sql_echo)
+        engine = create_pooled_engine(database_url, echo=sql_echo)
         Base.metadata.create_all(bind=engine)
         logger.info("Database engine created successfully")
         return engine
@@ -299,11 +300,24 @@ def get_database_engine():
         return None
 
 
-def get_session():
-    """Get a database session."""
+@st.cache_resource
+def get_session_factory():
+    """
+    Create and cache the session factory.
+
+    The dashboard only reads, so autoflush is off (no flush check before
+    every query) and objects stay usable after commit.
+    """
     engine = get_database_engine()
     if engine:
-        Session = sessionmaker(bind=engine)
+        return sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    return None
+
+
+def get_session():
+    """Get a database session."""
+    Session = get_session_factory()
+    if Session:
         return Session()
     return None
 
@@ -424,7 +438,14 @@ def get_all_profiles() -> pd.DataFrame:
         return pd.DataFrame()
     
     try:
-        profiles = session.query(Profile).filter(Profile.is_active == True).all()
+        # Column projection: plain rows, no ORM instances to hydrate
+        profiles = session.execute(
+            select(
+                Profile.id, Profile.platform, Profile.username, Profile.display_name,
+                Profile.avatar_url, Profile.follower_count, Profile.total_likes,
+                Profile.video_count, Profile.average_post_views, Profile.last_scraped_at,
+            ).where(Profile.is_active == True)
+        ).all()
         
         data = [{
             "id": p.id,
@@ -458,20 +479,20 @@ def get_profile_history(profile_id: int, days: int = 30) -> pd.DataFrame:
     try:
         cutoff = datetime.utcnow() - timedelta(days=days)
         
-        history = session.query(ProfileHistory).filter(
-            ProfileHistory.profile_id == profile_id,
-            ProfileHistory.recorded_at >= cutoff
-        ).order_by(ProfileHistory.recorded_at).all()
+        history = session.execute(
+            select(
+                ProfileHistory.recorded_at.label("date"),
+                ProfileHistory.follower_count.label("followers"),
+                ProfileHistory.total_likes.label("likes"),
+                ProfileHistory.video_count.label("videos"),
+                ProfileHistory.follower_change,
+            ).where(
+                ProfileHistory.profile_id == profile_id,
+                ProfileHistory.recorded_at >= cutoff
+            ).order_by(ProfileHistory.recorded_at)
+        ).mappings().all()
         
-        data = [{
-            "date": h.recorded_at,
-            "followers": h.follower_count,
-            "likes": h.total_likes,
-            "videos": h.video_count,
-            "follower_change": h.follower_change
-        } for h in history]
-        
-        return pd.DataFrame(data)
+        return pd.DataFrame(history)
     finally:
         session.close()
 
@@ -512,7 +533,7 @@ def get_all_posts(days: int = 30) -> pd.DataFrame:
 
             data.append({
                 "id": p.Post.id,
-                "post_id": p.Post.platform_post_id or p.Post.tiktok_post_id,
+                "post_id": p.Post.platform_post_id,
                 "platform": platform,
                 "username": f"@{p.Profile.username}",
                 "description": (p.Post.description or "")[:80] + "..." if p.Post.description and len(p.Post.description) > 80 else (p.Post.description or ""),
@@ -622,24 +643,23 @@ def get_reddit_traffic(subreddit_name: Optional[str] = None, days: int = 30) ->
         return pd.DataFrame()
 
     try:
-        cutoff = datetime.utcnow() - timedelta(days=days)
+        # timestamp is a DATE column; compare against a date so the index is usable
+        cutoff = (datetime.utcnow() - timedelta(days=days)).date()
 
-        query = session.query(SubredditTraffic).filter(
-            SubredditTraffic.timestamp >= cutoff
-        )
+        query = select(
+            SubredditTraffic.timestamp.label("date"),
+            SubredditTraffic.subreddit_name.label("subreddit"),
+            SubredditTraffic.unique_visitors,
+            SubredditTraffic.pageviews,
+            SubredditTraffic.subscriptions,
+        ).where(SubredditTraffic.timestamp >= cutoff)
 
         if subreddit_name:
-            query = query.filter(SubredditTraffic.subreddit_name == subreddit_name)
+            query = query.where(SubredditTraffic.subreddit_name == subreddit_name)
 
-        traffic = query.order_by(SubredditTraffic.timestamp.desc()).all()
-
-        data = [{
-            "date": t.timestamp,
-            "subreddit": t.subreddit_name,
-            "unique_visitors": t.unique_visitors,
-            "pageviews": t.pageviews,
-            "subscriptions": t.subscriptions,
-        } for t in traffic]
+        data = session.execute(
+            query.order_by(SubredditTraffic.timestamp.desc())
+        ).mappings().all()
 
         logger.debug(f"Fetched {len(data)} Reddit traffic records")
         return pd.DataFrame(data)
@@ -1016,8 +1036,12 @@ def add_profile_to_watchlist(username: str, platform: str = 'tiktok') -> tuple[b
         scraper = ScraperFactory.get_scraper(platform)
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        profile = loop.run_until_complete(scraper.add_profile(username, send_notification=True))
-        loop.close()
+        try:
+            profile = loop.run_until_complete(scraper.add_profile(username, send_notification=True))
+        finally:
+            # The scraper is shared, but its HTTP clients belong to this loop
+            loop.run_until_complete(scraper.aclose())
+            loop.close()
 
         # Clear cache to refresh data
         get_all_profiles.clear()
@@ -27,6 +27,9 @@ class Config:
     VIRAL_THRESHOLD_MULTIPLIER: float = float(os.getenv("VIRAL_THRESHOLD", "5.0"))
     POSTS_LOOKBACK_DAYS: int = int(os.getenv("POSTS_LOOKBACK_DAYS", "30"))
     SCRAPE_INTERVAL_HOURS: int = int(os.getenv("SCRAPE_INTERVAL_HOURS", "6"))
+    MAX_CONCURRENT_UPDATES: int = int(os.getenv("MAX_CONCURRENT_UPDATES", "4"))  # Profiles refreshed in parallel
+    API_MIN_REQUEST_INTERVAL: float = float(os.getenv("API_MIN_REQUEST_INTERVAL", "2.0"))  # Seconds between TikTok API calls (floor)
+    UPDATES_PER_SECOND: float = float(os.getenv("UPDATES_PER_SECOND", "0.5"))  # Profile refresh starts, per platform
     
     # Logging & Debugging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")  # DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -2,7 +2,7 @@
 Pulse Database Module
 """
 
-from database.models import Base, Profile, ProfileHistory, Post, PostHistory, AlertLog
+from database.models import Base, Profile, ProfileHistory, Post, PostHistory, AlertLog, SubredditTraffic
 from database.connection import init_database, get_session, get_db_context
 
 __all__ = [
@@ -12,6 +12,7 @@ __all__ = [
     "Post",
     "PostHistory",
     "AlertLog",
+    "SubredditTraffic",
     "init_database",
     "get_session",
     "get_db_context",
@@ -4,11 +4,13 @@ Database Connection & Session Management
 """
 
 import os
-from sqlalchemy import create_engine, text
+import threading
+from sqlalchemy import bindparam, event, text
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.exc import OperationalError, ProgrammingError
 from contextlib import contextmanager
 
+from database.engine import create_pooled_engine, get_driver_options  # noqa: F401
 from database.models import Base
 from services.logger import get_logger
 
@@ -44,6 +46,9 @@ def get_sql_echo() -> bool:
 engine = None
 SessionLocal = None
 
+# Guards lazy initialization so concurrent first requests don't build two pools
+_init_lock = threading.Lock()
+
 
 def init_database():
     """
@@ -62,13 +67,10 @@ def init_database():
     if sql_echo:
         logger.warning("SQL_ECHO=True - All SQL queries will be logged (disable in production)")
     
-    engine = create_engine(
+    engine = create_pooled_engine(
         database_url,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,  # Verify connections before use
         echo=sql_echo,       # Print raw SQL queries when SQL_ECHO=True
-        echo_pool=sql_echo   # Also log connection pool events
+        echo_pool=sql_echo,  # Also log connection pool events
     )
     
     # Create all tables (safe - only creates if not exists)
@@ -80,20 +82,57 @@ def init_database():
         raise
     
     # Create session factory
-    SessionLocal = scoped_session(
-        sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    )
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    event.listen(factory, "after_flush", _mark_writes)
+    event.listen(factory, "do_orm_execute", _mark_write_statement)
+    event.listen(factory, "after_commit", _clear_writes)
+    event.listen(factory, "after_rollback", _clear_writes)
+    SessionLocal = scoped_session(factory)
     
     return engine
 
 
+# =============================================================================
+# WRITE TRACKING
+# =============================================================================
+# Flushed changes no longer show up in session.new/dirty/deleted, and bulk
+# UPDATE/DELETE statements never do, so record writes in session.info.
+
+def _mark_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+def _mark_write_statement(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+def _clear_writes(session):
+    session.info.pop("has_writes", None)
+
+
+def _has_pending_writes(session) -> bool:
+    """True if the session has unflushed changes or has already sent writes."""
+    return bool(
+        session.new or session.dirty or session.deleted
+        or session.info.get("has_writes")
+    )
+
+
+def _ensure_database():
+    """Initialize the database once, even if called from several threads at once."""
+    if SessionLocal is None:
+        with _init_lock:
+            if SessionLocal is None:
+                init_database()
+
+
 def get_session():
     """
     Get a database session.
     Use with context manager or ensure you close it manually.
     """
-    if SessionLocal is None:
-        init_database()
+    _ensure_database()
     return SessionLocal()
 
 
@@ -102,6 +141,7 @@ def get_db_context():
     """
     Context manager for database sessions.
     Automatically handles commit/rollback and closing.
+    Read-only blocks end with a rollback instead of a COMMIT round-trip.
     
     Usage:
         with get_db_context() as db:
@@ -110,7 +150,10 @@ def get_db_context():
     session = get_session()
     try:
         yield session
-        session.commit()
+        if _has_pending_writes(session):
+            session.commit()
+        else:
+            session.rollback()
     except Exception as e:
         session.rollback()
         logger.error(f"Database transaction failed: {e}")
@@ -123,6 +166,31 @@ def get_db_context():
 # SCHEMA VALIDATION
 # =============================================================================
 
+# Parameterized column probe, built once and reused for every table/column check
+_COLUMN_EXISTS = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = :table AND column_name = :column
+    )
+""")
+
+# Every column of the given tables, for checking many columns in one round-trip
+_TABLE_COLUMNS = text("""
+    SELECT table_name, column_name
+    FROM information_schema.columns
+    WHERE table_name IN :tables
+""").bindparams(bindparam("tables", expanding=True))
+
+
+def _column_exists(conn, table: str, column: str) -> bool:
+    return bool(conn.execute(_COLUMN_EXISTS, {"table": table, "column": column}).scalar())
+
+
+def _existing_columns(conn, tables) -> set:
+    """Return {(table, column)} for every column of the given tables."""
+    return set(conn.execute(_TABLE_COLUMNS, {"tables": list(tables)}).tuples())
+
+
 def check_schema_health() -> dict:
     """
     Perform a comprehensive health check on the database schema.
@@ -134,8 +202,7 @@ def check_schema_health() -> dict:
             print(f"Missing columns: {health['missing_columns']}")
             print(f"Schema version: {health['schema_version']}")
     """
-    if engine is None:
-        init_database()
+    _ensure_database()
 
     result = {
         "healthy": True,
@@ -162,35 +229,19 @@ def check_schema_health() -> dict:
 
     try:
         with engine.connect() as conn:
-            # First, detect schema version
-            platform_check = conn.execute(text("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name = 'profiles' AND column_name = 'platform'
-            """))
+            existing = _existing_columns(conn, required_columns)
 
-            if platform_check.fetchone():
+            # First, detect schema version
+            if ("profiles", "platform") in existing:
                 result["schema_version"] = "0.0.2"
-            else:
-                # Check for v0.0.1 (basic TikTok schema)
-                tiktok_check = conn.execute(text("""
-                    SELECT column_name
-                    FROM information_schema.columns
-                    WHERE table_name = 'profiles' AND column_name = 'tiktok_user_id'
-                """))
-                if tiktok_check.fetchone():
-                    result["schema_version"] = "0.0.1"
+            elif _column_exists(conn, "profiles", "tiktok_user_id"):
+                # v0.0.1 (basic TikTok schema)
+                result["schema_version"] = "0.0.1"
 
             # Now check for all required columns
             for table, columns in required_columns.items():
                 for column in columns:
-                    check = conn.execute(text("""
-                        SELECT column_name
-                        FROM information_schema.columns
-                        WHERE table_name = :table AND column_name = :column
-                    """), {"table": table, "column": column})
-
-                    if check.fetchone() is None:
+                    if (table, column) not in existing:
                         result["missing_columns"].append(f"{table}.{column}")
                         result["healthy"] = False
 
@@ -212,29 +263,16 @@ def get_schema_version() -> str:
     """
     Attempt to detect current schema version based on columns present.
     """
-    if engine is None:
-        init_database()
+    _ensure_database()
     
     try:
         with engine.connect() as conn:
             # Check for v0.0.2 marker (platform column)
-            check = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'profiles' AND column_name = 'platform'
-            """))
-            
-            if check.fetchone():
+            if _column_exists(conn, "profiles", "platform"):
                 return "0.0.2"
             
             # Check for v0.0.1 (basic TikTok schema)
-            check = conn.execute(text("""
-                SELECT column_name 
-                FROM information_schema.columns 
-                WHERE table_name = 'profiles' AND column_name = 'tiktok_user_id'
-            """))
-            
-            if check.fetchone():
+            if _column_exists(conn, "profiles", "tiktok_user_id"):
                 return "0.0.1"
             
             return "unknown"
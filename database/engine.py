@@ -0,0 +1,85 @@
+"""
+Pulse - Multi-Platform Analytics Dashboard
+Engine Factory
+
+One place that knows how Pulse engines should be tuned, shared by the app,
+the scraper, the Reddit sync, the reset utility and the migration runner
+(which asks for a smaller pool).
+"""
+
+from functools import lru_cache
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+
+# Pool defaults for the app, scraper and cron scripts. Railway's PostgreSQL
+# plans allow a limited number of connections shared by the dashboard, the
+# scraper and the cron jobs, so each process keeps at most POOL_SIZE idle
+# sockets and recycles them before the proxy drops them. Overflow connections
+# are closed as soon as they are returned, so bursts (the bulk profile
+# refresh running next to its alert logging) can borrow up to MAX_OVERFLOW
+# extra sockets without holding them. The migration runner overrides both
+# down to a 1 + 2 pool.
+POOL_SIZE = 10
+MAX_OVERFLOW = 20
+POOL_RECYCLE_SECONDS = 1800
+
+# Compiled-statement cache entries per engine (SQLAlchemy default: 500).
+# The scraper's multi-row post upserts compile to a distinct statement for
+# every batch size, which would otherwise churn the default cache.
+QUERY_CACHE_SIZE = 1200
+
+
+def get_driver_options(database_url: str) -> dict:
+    """
+    Driver-specific engine tuning for the configured PostgreSQL DBAPI.
+
+    - psycopg2: batch executemany() calls into multi-row VALUES pages and skip
+      the hstore OID lookup on every new connection.
+    - psycopg (v3): let the driver prepare statements server-side once they
+      have been executed a few times on the same connection.
+    """
+    driver = make_url(database_url).get_driver_name()
+
+    if driver == "psycopg2":
+        return {
+            "executemany_mode": "values_plus_batch",
+            "executemany_batch_page_size": 500,  # UPDATE/DELETE pages (default 100)
+            "use_native_hstore": False,
+        }
+    if driver == "psycopg":
+        return {"connect_args": {"prepare_threshold": 5}}
+    return {}
+
+
+def create_pooled_engine(database_url: str, **overrides):
+    """
+    Create an engine with Pulse's pool and driver tuning.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        **overrides: Any create_engine() keyword to change (e.g. pool_size, echo)
+    """
+    options = {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_pre_ping": True,  # Verify connections before use
+        "pool_recycle": POOL_RECYCLE_SECONDS,
+        "query_cache_size": QUERY_CACHE_SIZE,
+        **get_driver_options(database_url),
+    }
+    options.update(overrides)
+
+    return create_engine(database_url, **options)
+
+
+@lru_cache(maxsize=None)
+def get_engine(database_url: str):
+    """
+    Return the process-wide engine for a database URL, creating it once.
+
+    Repeated resets/migrations in the same process reuse the pool (and its
+    authenticated connections) instead of building a new engine each time.
+    """
+    return create_pooled_engine(database_url)
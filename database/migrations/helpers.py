@@ -0,0 +1,268 @@
+"""
+Pulse Database Migrations - Shared Helpers
+
+Utilities used by more than one migration script.
+"""
+
+import logging
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# SHARED ENGINE
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def get_engine(database_url: str):
+    """
+    Return one engine per database URL for the whole migration run.
+
+    The runner and every migration it calls share this engine, so chained
+    migrations reuse a warm pooled connection instead of reconnecting.
+    Driver tuning comes from database.engine; only the pool is smaller.
+    """
+    from sqlalchemy.engine import make_url
+
+    from database.engine import create_pooled_engine, get_driver_options
+
+    kwargs = {}
+    if make_url(database_url).get_backend_name() == "postgresql":
+        # TCP keepalives stop idle sockets being dropped between long DDL steps
+        kwargs["connect_args"] = {
+            **get_driver_options(database_url).get("connect_args", {}),
+            "keepalives": 1,
+            "keepalives_idle": 30,
+        }
+
+    return create_pooled_engine(
+        database_url,
+        pool_size=1,      # One warm connection between migrations
+        max_overflow=2,   # Runner probe + migration transaction (or advisory lock) + concurrent index build
+        **kwargs
+    )
+
+
+# =============================================================================
+# MIGRATION STATE
+# =============================================================================
+
+MIGRATION_STATE_QUERY = """
+    SELECT
+        EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'profiles' AND column_name = 'platform'
+        ) AS v002_done,
+        (
+            SELECT character_maximum_length FROM information_schema.columns
+            WHERE table_name = 'profiles' AND column_name = 'platform_user_id'
+        ) AS v003_len,
+        to_regclass('subreddit_traffic') IS NOT NULL AS v004_done
+"""
+
+
+def migration_state(conn) -> dict:
+    """
+    Return the applied state of every versioned migration in one round-trip.
+
+    Keys:
+        v002_done: profiles.platform exists
+        v003_len:  character_maximum_length of profiles.platform_user_id (or None)
+        v004_done: subreddit_traffic table exists
+    """
+    return dict(conn.exec_driver_sql(MIGRATION_STATE_QUERY).mappings().one())
+
+
+# =============================================================================
+# LOCK TIMEOUTS
+# =============================================================================
+
+# Fail fast instead of queueing behind a long query while blocking everyone else
+SET_LOCK_TIMEOUT_SQL = "SET LOCAL lock_timeout = '3s'"
+SET_STATEMENT_TIMEOUT_SQL = "SET LOCAL statement_timeout = '60s'"
+
+# SQLSTATEs worth retrying: lock_not_available, query_canceled (statement timeout)
+RETRYABLE_SQLSTATES = {"55P03", "57014"}
+
+
+def set_local_timeouts(conn) -> None:
+    """Apply lock/statement timeouts to the connection's current transaction."""
+    conn.exec_driver_sql(SET_LOCK_TIMEOUT_SQL)
+    conn.exec_driver_sql(SET_STATEMENT_TIMEOUT_SQL)
+
+
+def run_with_lock_retry(fn, *args, max_attempts: int = 4, initial_delay: float = 2.0):
+    """
+    Call fn(*args), retrying with exponential backoff when it hits a lock or
+    statement timeout. Any other error (or the final timeout) is re-raised.
+    """
+    from sqlalchemy.exc import OperationalError
+
+    delay = initial_delay
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return fn(*args)
+        except OperationalError as e:
+            sqlstate = getattr(e.orig, "pgcode", None) or getattr(e.orig, "sqlstate", None)
+            if sqlstate not in RETRYABLE_SQLSTATES or attempt == max_attempts:
+                raise
+            logger.warning(
+                f"⚠️  Lock/statement timeout (attempt {attempt}/{max_attempts}). "
+                f"Retrying in {delay:.0f}s..."
+            )
+            time.sleep(delay)
+            delay *= 2
+
+
+# =============================================================================
+# ADVISORY LOCKS
+# =============================================================================
+
+XACT_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext(%(name)s))"
+TRY_SESSION_LOCK_SQL = "SELECT pg_try_advisory_lock(hashtext(%(name)s))"
+SESSION_UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtext(%(name)s))"
+
+
+def xact_advisory_lock(conn, name: str) -> None:
+    """
+    Serialize a migration across processes for the rest of the transaction.
+
+    Blocks until any other holder of the same lock name commits, then holds
+    it until this transaction ends, so there is nothing to release on error.
+    Call it before the "already applied?" check so a second worker sees the
+    first worker's committed result.
+    """
+    conn.exec_driver_sql(XACT_LOCK_SQL, {"name": name})
+
+
+@contextmanager
+def session_advisory_lock(engine, name: str, poll_interval: float = 1.0):
+    """
+    Serialize a migration that builds indexes CONCURRENTLY across processes.
+
+    The lock lives on its own AUTOCOMMIT connection for the whole block, so
+    it can span the concurrent builds that xact_advisory_lock cannot. Waiters
+    poll pg_try_advisory_lock instead of blocking in pg_advisory_lock: a
+    blocked lock query holds a snapshot, and CREATE INDEX CONCURRENTLY in the
+    holder waits for every older snapshot - a client-side cycle the server's
+    deadlock detector never sees. Re-check the "already applied?" state
+    inside the block.
+    """
+    conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        waiting = False
+        while not conn.exec_driver_sql(TRY_SESSION_LOCK_SQL, {"name": name}).scalar():
+            if not waiting:
+                logger.info(f"⏳ Another worker holds {name} - waiting for it to finish...")
+                waiting = True
+            time.sleep(poll_interval)
+
+        try:
+            yield
+        finally:
+            conn.exec_driver_sql(SESSION_UNLOCK_SQL, {"name": name})
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# FAST-PATH PROBE
+# =============================================================================
+
+def fast_probe(database_url: str, sql: str):
+    """
+    Run a single-value catalog probe over a bare psycopg2 connection.
+
+    Used by standalone migration runs to decide "already applied" without
+    importing the SQLAlchemy engine machinery. Returns None if psycopg2 isn't
+    available so the caller falls back to the normal engine path.
+    """
+    try:
+        import psycopg2
+    except ImportError:
+        return None
+
+    # libpq understands postgresql:// but not SQLAlchemy's +driver suffix
+    dsn = re.sub(r"^postgresql\+\w+://", "postgresql://", database_url)
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+            row = cursor.fetchone()
+            return row[0] if row else None
+    finally:
+        conn.close()
+
+
+# =============================================================================
+# BATCHED DDL
+# =============================================================================
+
+def build_script(stmts: list) -> str:
+    """Join statements into one semicolon-separated script for a single round-trip."""
+    return ";\n".join(stmt.strip() for stmt in stmts) + ";"
+
+
+def execute_batch(conn, stmts: list) -> None:
+    """
+    Run a list of parameterless statements inside the connection's transaction.
+
+    - psycopg (v3, postgresql+psycopg:// URLs): statements are queued in libpq
+      pipeline mode, so the client never waits on the server between them while
+      errors are still reported per statement.
+    - psycopg2 (default): the statements are joined into one script and sent
+      as a single simple query.
+    """
+    if conn.dialect.driver == "psycopg":
+        raw = conn.connection.driver_connection
+        with raw.pipeline(), raw.cursor() as cursor:
+            for stmt in stmts:
+                cursor.execute(stmt)
+        return
+
+    conn.exec_driver_sql(build_script(stmts))
+
+
+# =============================================================================
+# CONCURRENT INDEX BUILDS
+# =============================================================================
+
+INVALID_INDEXES_QUERY = """
+    SELECT c.relname
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid
+    AND c.relname = ANY(%(names)s)
+"""
+
+
+def create_indexes_concurrently(engine, indexes: dict) -> None:
+    """
+    Build indexes with CREATE INDEX CONCURRENTLY so writes keep flowing.
+
+    CONCURRENTLY cannot run inside a transaction block, so this uses its own
+    AUTOCOMMIT connection and must be called after the migration's transaction
+    has committed. An interrupted concurrent build leaves an INVALID index behind
+    that IF NOT EXISTS would happily skip, so those are dropped and rebuilt.
+
+    Args:
+        engine: SQLAlchemy engine for the target database
+        indexes: Mapping of index name -> definition, e.g.
+                 {"idx_posts_platform": "ON posts(platform)"}
+    """
+    if not indexes:
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        result = conn.exec_driver_sql(INVALID_INDEXES_QUERY, {"names": list(indexes)})
+        for (name,) in result.fetchall():
+            logger.warning(f"  ⚠️  Dropping invalid index left by an interrupted build: {name}")
+            conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+        for name, definition in indexes.items():
+            logger.info(f"  📇 Creating index {name} (concurrently)...")
+            conn.exec_driver_sql(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
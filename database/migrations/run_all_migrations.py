@@ -7,9 +7,14 @@ This script:
 2. Adds multi-platform support columns if needed (v0.0.2)
 3. Increases ID column lengths for long secUid values (v0.0.3)
 4. Adds subreddit_traffic table for Reddit analytics (v0.0.4)
+5. Tunes indexes on existing databases to match the models (v0.0.5)
+6. Drops the legacy tiktok_user_id / tiktok_post_id columns (v0.0.6)
+7. Moves created_at / updated_at to TIMESTAMPTZ with now() defaults (v0.0.7)
+8. Installs the updated_at BEFORE UPDATE triggers (v0.0.8)
+9. Adds unique constraints missing from create_all databases (v0.0.9)
 
 Railway Environment Variable Handling:
-- Retries up to 10 times with exponential backoff (max 30s total)
+- Checks immediately, then retries with exponential backoff from 0.1s (max 5s total)
 - Provides detailed diagnostics if DATABASE_URL is not available
 """
 
@@ -22,8 +27,8 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from sqlalchemy import create_engine, text, inspect
 from database.models import Base
+from database.migrations.helpers import get_engine, migration_state
 
 # Configure logging
 logging.basicConfig(
@@ -32,31 +37,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Tables that must exist after the base schema (v0.0.1) is in place
+_REQUIRED_TABLES: frozenset = frozenset((
+    'profiles', 'profile_history', 'posts', 'post_history', 'alert_logs'
+))
 
-def get_database_url(max_retries: int = 10, initial_delay: float = 0.5) -> str:
+
+def get_database_url(initial_delay: float = 0.1, max_wait: float = 5.0) -> str:
     """
     Get database URL from environment with retry logic for Railway deployments.
 
-    Railway may inject environment variables with a slight delay during container startup.
-    This function retries with exponential backoff to handle timing issues.
+    Railway normally injects environment variables before the process starts, so the
+    first check never sleeps. If the variable is missing, retries back off from
+    initial_delay (doubling each time) until max_wait seconds have elapsed in total.
 
     Args:
-        max_retries: Maximum number of retry attempts (default: 10)
-        initial_delay: Initial delay in seconds, doubles each retry (default: 0.5s)
+        initial_delay: Delay before the first retry in seconds (default: 0.1s)
+        max_wait: Maximum total time to wait for DATABASE_URL (default: 5s)
 
     Returns:
         Database URL string
 
     Raises:
-        ValueError: If DATABASE_URL is not available after all retries
+        ValueError: If DATABASE_URL is not available within max_wait seconds
     """
     delay = initial_delay
+    start = time.monotonic()
+    attempt = 0
 
-    for attempt in range(max_retries):
+    while True:
+        attempt += 1
         database_url = os.getenv("DATABASE_URL", "")
 
         if database_url:
-            logger.info(f"✅ DATABASE_URL found (attempt {attempt + 1}/{max_retries})")
+            logger.info(f"✅ DATABASE_URL found (attempt {attempt})")
 
             # Railway uses 'postgres://' but SQLAlchemy requires 'postgresql://'
             if database_url.startswith("postgres://"):
@@ -65,47 +79,51 @@ def get_database_url(max_retries: int = 10, initial_delay: float = 0.5) -> str:
 
             return database_url
 
-        # DATABASE_URL not found - wait and retry
-        if attempt < max_retries - 1:  # Don't wait on last attempt
+        # DATABASE_URL not found - wait and retry while within the time budget
+        remaining = max_wait - (time.monotonic() - start)
+        if remaining > 0:
+            sleep_for = min(delay, remaining)
             logger.warning(
-                f"⚠️  DATABASE_URL not set (attempt {attempt + 1}/{max_retries}). "
-                f"Retrying in {delay:.1f}s..."
-            )
-            time.sleep(delay)
-            delay = min(delay * 2, 5.0)  # Exponential backoff, max 5s
-        else:
-            # Final attempt failed - provide diagnostics
-            logger.error("=" * 70)
-            logger.error("❌ DATABASE_URL ENVIRONMENT VARIABLE NOT FOUND")
-            logger.error("=" * 70)
-            logger.error("")
-            logger.error("Available environment variables:")
-            env_vars = sorted([k for k in os.environ.keys() if not k.startswith('_')])
-            for var in env_vars[:20]:  # Show first 20 non-private vars
-                logger.error(f"  - {var}")
-            if len(env_vars) > 20:
-                logger.error(f"  ... and {len(env_vars) - 20} more")
-            logger.error("")
-            logger.error("Troubleshooting:")
-            logger.error("1. Verify DATABASE_URL is set in Railway environment variables")
-            logger.error("2. Check Railway service settings for PostgreSQL plugin")
-            logger.error("3. Ensure the database service is running")
-            logger.error("4. Review Railway deployment logs for database provisioning")
-            logger.error("")
-
-            raise ValueError(
-                "DATABASE_URL environment variable is not set after "
-                f"{max_retries} attempts. See logs above for diagnostics."
+                f"⚠️  DATABASE_URL not set (attempt {attempt}). "
+                f"Retrying in {sleep_for:.1f}s..."
             )
-
-    # Should never reach here, but added for type safety
-    raise ValueError("Unexpected error in get_database_url retry logic")
-
-
-def table_exists(engine, table_name: str) -> bool:
-    """Check if a table exists in the database."""
-    inspector = inspect(engine)
-    return table_name in inspector.get_table_names()
+            time.sleep(sleep_for)
+            delay *= 2
+            continue
+
+        # Time budget exhausted - provide diagnostics
+        logger.error("=" * 70)
+        logger.error("❌ DATABASE_URL ENVIRONMENT VARIABLE NOT FOUND")
+        logger.error("=" * 70)
+        logger.error("")
+        logger.error("Available environment variables:")
+        env_vars = sorted([k for k in os.environ.keys() if not k.startswith('_')])
+        for var in env_vars[:20]:  # Show first 20 non-private vars
+            logger.error(f"  - {var}")
+        if len(env_vars) > 20:
+            logger.error(f"  ... and {len(env_vars) - 20} more")
+        logger.error("")
+        logger.error("Troubleshooting:")
+        logger.error("1. Verify DATABASE_URL is set in Railway environment variables")
+        logger.error("2. Check Railway service settings for PostgreSQL plugin")
+        logger.error("3. Ensure the database service is running")
+        logger.error("4. Review Railway deployment logs for database provisioning")
+        logger.error("")
+
+        raise ValueError(
+            "DATABASE_URL environment variable is not set after "
+            f"{attempt} attempts ({max_wait:g}s). See logs above for diagnostics."
+        )
+
+
+def table_exists(conn, table_name: str) -> bool:
+    """Check if a table exists in the database (targeted pg_class lookup)."""
+    return conn.dialect.has_table(conn, table_name)
+
+
+def get_existing_tables(conn) -> set:
+    """Return which of the model tables exist."""
+    return {name for name in Base.metadata.tables if table_exists(conn, name)}
 
 
 def run_migrations():
@@ -118,54 +136,54 @@ def run_migrations():
     logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
     logger.info("")
 
-    engine = create_engine(database_url)
+    engine = get_engine(database_url)
 
     try:
-        # =====================================================================
-        # STEP 1: Create base schema if tables don't exist (v0.0.1)
-        # =====================================================================
-        if not table_exists(engine, 'profiles'):
-            logger.info("🆕 Fresh database detected - creating initial schema (v0.0.1)")
-            logger.info("")
-            logger.info("Creating tables from SQLAlchemy models...")
+        with engine.connect() as conn:
+            existing_tables = get_existing_tables(conn)
 
-            Base.metadata.create_all(engine)
+            # =====================================================================
+            # STEP 1: Create base schema if tables don't exist (v0.0.1)
+            # =====================================================================
+            if 'profiles' not in existing_tables:
+                logger.info("🆕 Fresh database detected - creating initial schema (v0.0.1)")
+                logger.info("")
+                logger.info("Creating tables from SQLAlchemy models...")
 
-            logger.info("✅ Initial schema created!")
-            logger.info("   Tables: profiles, profile_history, posts, post_history, alert_logs")
-            logger.info("")
-        else:
-            logger.info("✅ Existing database detected - tables already exist")
-            logger.info("")
+                # When none of the model tables exist, skip the per-table existence check
+                Base.metadata.create_all(bind=conn, checkfirst=bool(existing_tables))
+                conn.commit()
+                existing_tables = get_existing_tables(conn)
 
-        # =====================================================================
-        # STEP 2: Verify all tables are present
-        # =====================================================================
-        required_tables = ['profiles', 'profile_history', 'posts', 'post_history', 'alert_logs']
-        missing_tables = [t for t in required_tables if not table_exists(engine, t)]
+                logger.info("✅ Initial schema created!")
+                logger.info("   Tables: profiles, profile_history, posts, post_history, alert_logs")
+                logger.info("")
+            else:
+                logger.info("✅ Existing database detected - tables already exist")
+                logger.info("")
 
-        if missing_tables:
-            logger.error(f"❌ Missing tables: {missing_tables}")
-            logger.error("   Database is in an inconsistent state!")
-            return False
+            # =====================================================================
+            # STEP 2: Verify all tables are present
+            # =====================================================================
+            missing_tables = sorted(_REQUIRED_TABLES - existing_tables)
 
-        logger.info("✅ All required tables present")
-        logger.info("")
+            if missing_tables:
+                logger.error(f"❌ Missing tables: {missing_tables}")
+                logger.error("   Database is in an inconsistent state!")
+                return False
 
-        # =====================================================================
-        # STEP 3: Check and run v0.0.2 migration if needed
-        # =====================================================================
-        logger.info("🔍 Checking for v0.0.2 migration...")
+            logger.info("✅ All required tables present")
+            logger.info("")
 
-        with engine.connect() as conn:
-            # Check if v0.0.2 migration is needed
-            result = conn.execute(text("""
-                SELECT column_name
-                FROM information_schema.columns
-                WHERE table_name = 'profiles' AND column_name = 'platform'
-            """))
-
-            if not result.fetchone():
+            # One probe decides which of v0.0.2-v0.0.4 still need to run
+            state = migration_state(conn)
+
+            # =====================================================================
+            # STEP 3: Check and run v0.0.2 migration if needed
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.2 migration...")
+
+            if not state["v002_done"]:
                 logger.info("⚠️  Schema needs upgrade to v0.0.2")
                 logger.info("")
 
@@ -175,34 +193,32 @@ def run_migrations():
                 logger.info("🚀 Applying v0.0.2 migration (Multi-Platform Support)...")
                 logger.info("")
 
+                # Close the probe transaction so it doesn't sit idle during the migration
+                conn.rollback()
+
                 from database.migrations.v002_multiplatform import run_migration as run_v002
 
-                success = run_v002()
+                success = run_v002(engine)
 
                 if not success:
                     logger.error("❌ Migration v0.0.2 failed")
                     return False
 
+                # v0.0.2 creates/renames platform_user_id, so refresh the state
+                state = migration_state(conn)
+
                 logger.info("")
             else:
                 logger.info("✅ v0.0.2 already applied (platform column exists)")
                 logger.info("")
 
-        # =====================================================================
-        # STEP 4: Check and run v0.0.3 migration if needed
-        # =====================================================================
-        logger.info("🔍 Checking for v0.0.3 migration...")
+            # =====================================================================
+            # STEP 4: Check and run v0.0.3 migration if needed
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.3 migration...")
 
-        with engine.connect() as conn:
             # Check if v0.0.3 migration is needed (check column length)
-            result = conn.execute(text("""
-                SELECT character_maximum_length
-                FROM information_schema.columns
-                WHERE table_name = 'profiles'
-                AND column_name = 'platform_user_id'
-            """))
-
-            current_length = result.scalar()
+            current_length = state["v003_len"]
 
             if current_length and current_length < 255:
                 logger.info(f"⚠️  Schema needs upgrade to v0.0.3 (current length: {current_length})")
@@ -214,9 +230,12 @@ def run_migrations():
                 logger.info("🚀 Applying v0.0.3 migration (Increase ID Column Lengths)...")
                 logger.info("")
 
+                # Close the probe transaction so it doesn't sit idle during the migration
+                conn.rollback()
+
                 from database.migrations.v003_increase_id_lengths import run_migration as run_v003
 
-                success = run_v003()
+                success = run_v003(engine)
 
                 if not success:
                     logger.error("❌ Migration v0.0.3 failed")
@@ -227,41 +246,108 @@ def run_migrations():
                 logger.info(f"✅ v0.0.3 already applied (platform_user_id is VARCHAR({current_length}))")
                 logger.info("")
 
-        # =====================================================================
-        # STEP 5: Check and run v0.0.4 migration if needed
-        # =====================================================================
-        logger.info("🔍 Checking for v0.0.4 migration...")
+            # =====================================================================
+            # STEP 5: Run v0.0.4 migration (checks its own table and index state)
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.4 migration...")
 
-        with engine.connect() as conn:
-            # Check if v0.0.4 migration is needed (check for subreddit_traffic table)
-            result = conn.execute(text("""
-                SELECT table_name
-                FROM information_schema.tables
-                WHERE table_name = 'subreddit_traffic'
-            """))
-
-            if not result.fetchone():
+            # Runs even when subreddit_traffic exists, so an index build that
+            # was interrupted after the table committed is repaired
+            if not state["v004_done"]:
                 logger.info("⚠️  Schema needs upgrade to v0.0.4")
-                logger.info("")
-
-                # =====================================================================
-                # Run v0.0.4 migration (add subreddit_traffic table)
-                # =====================================================================
                 logger.info("🚀 Applying v0.0.4 migration (Subreddit Traffic Analytics)...")
                 logger.info("")
 
-                from database.migrations.v004_subreddit_traffic import run_migration as run_v004
+            # Close the probe transaction so it doesn't sit idle during the migration
+            conn.rollback()
 
-                success = run_v004()
+            from database.migrations.v004_subreddit_traffic import run_migration as run_v004
 
-                if not success:
-                    logger.error("❌ Migration v0.0.4 failed")
-                    return False
+            success = run_v004(engine)
 
-                logger.info("")
-            else:
-                logger.info("✅ v0.0.4 already applied (subreddit_traffic table exists)")
-                logger.info("")
+            if not success:
+                logger.error("❌ Migration v0.0.4 failed")
+                return False
+
+            logger.info("")
+
+            # =====================================================================
+            # STEP 6: Run v0.0.5 schema tuning (checks its own index state)
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.5 migration...")
+
+            # Close the probe transaction so it doesn't sit idle during the migration
+            conn.rollback()
+
+            from database.migrations.v005_schema_tuning import run_migration as run_v005
+
+            success = run_v005(engine)
+
+            if not success:
+                logger.error("❌ Migration v0.0.5 failed")
+                return False
+
+            logger.info("")
+
+            # =====================================================================
+            # STEP 7: Run v0.0.6 legacy column cleanup (checks its own state)
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.6 migration...")
+
+            from database.migrations.v006_drop_legacy_tiktok_ids import run_migration as run_v006
+
+            success = run_v006(engine)
+
+            if not success:
+                logger.error("❌ Migration v0.0.6 failed")
+                return False
+
+            logger.info("")
+
+            # =====================================================================
+            # STEP 8: Run v0.0.7 server-side timestamps (checks its own state)
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.7 migration...")
+
+            from database.migrations.v007_timestamptz_defaults import run_migration as run_v007
+
+            success = run_v007(engine)
+
+            if not success:
+                logger.error("❌ Migration v0.0.7 failed")
+                return False
+
+            logger.info("")
+
+            # =====================================================================
+            # STEP 9: Run v0.0.8 updated_at triggers (checks its own state)
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.8 migration...")
+
+            from database.migrations.v008_updated_at_trigger import run_migration as run_v008
+
+            success = run_v008(engine)
+
+            if not success:
+                logger.error("❌ Migration v0.0.8 failed")
+                return False
+
+            logger.info("")
+
+            # =====================================================================
+            # STEP 10: Run v0.0.9 unique constraints (checks its own state)
+            # =====================================================================
+            logger.info("🔍 Checking for v0.0.9 migration...")
+
+            from database.migrations.v009_unique_constraints import run_migration as run_v009
+
+            success = run_v009(engine)
+
+            if not success:
+                logger.error("❌ Migration v0.0.9 failed")
+                return False
+
+            logger.info("")
 
         # =====================================================================
         # ALL MIGRATIONS COMPLETE
@@ -272,9 +358,7 @@ def run_migrations():
         return True
 
     except Exception as e:
-        logger.error(f"❌ Migration failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Migration failed: {e}")
         return False
 
 
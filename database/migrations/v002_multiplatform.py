@@ -26,6 +26,15 @@ import sys
 import logging
 from datetime import datetime
 
+from database.migrations.helpers import (
+    create_indexes_concurrently,
+    execute_batch,
+    fast_probe,
+    get_engine,
+    run_with_lock_retry,
+    set_local_timeouts,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -34,6 +43,137 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# COLUMN DEFINITIONS (one ALTER TABLE per table)
+# =============================================================================
+
+PROFILE_COLUMNS = [
+    ("platform", "platform_type DEFAULT 'tiktok'"),
+    ("user_role", "user_role_type DEFAULT 'creator'"),
+    # Reddit-specific columns
+    ("subreddit_name", "VARCHAR(128)"),
+    ("subreddit_subscribers", "BIGINT"),
+    ("active_users", "INTEGER"),
+]
+
+POST_COLUMNS = [
+    ("platform", "platform_type DEFAULT 'tiktok'"),
+    # Twitter-specific columns
+    ("retweet_count", "BIGINT"),
+    ("quote_count", "BIGINT"),
+    ("bookmark_count", "BIGINT"),
+    ("impression_count", "BIGINT"),
+    # Reddit-specific columns
+    ("upvote_ratio", "FLOAT"),
+    ("is_crosspost", "BOOLEAN"),
+    ("original_subreddit", "VARCHAR(128)"),
+    ("reddit_score", "INTEGER"),
+]
+
+PROFILE_HISTORY_COLUMNS = [
+    ("subreddit_subscribers", "BIGINT"),
+    ("active_users", "INTEGER"),
+]
+
+POST_HISTORY_COLUMNS = [
+    ("retweet_count", "BIGINT"),
+    ("quote_count", "BIGINT"),
+    ("upvote_ratio", "FLOAT"),
+    ("reddit_score", "INTEGER"),
+]
+
+
+# Indexes built with CREATE INDEX CONCURRENTLY after the DDL transaction commits
+INDEXES = {
+    "idx_profiles_platform": "ON profiles(platform)",
+    "idx_profiles_active_platform": "ON profiles(is_active, platform)",
+    "idx_posts_platform": "ON posts(platform)",
+    "idx_alert_logs_platform": "ON alert_logs(platform)",
+}
+
+
+# Fast-path "already applied" probe for standalone runs
+APPLIED_PROBE_SQL = """
+    SELECT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'profiles' AND column_name = 'platform'
+    )
+"""
+
+
+# Post-migration record counts for both tables in a single query
+VERIFY_COUNTS_QUERY = """
+    SELECT 'profiles', COUNT(*) FROM profiles WHERE platform = 'tiktok'
+    UNION ALL
+    SELECT 'posts', COUNT(*) FROM posts WHERE platform = 'tiktok'
+"""
+
+
+# Session-level advisory lock so concurrent deploys don't both run the DDL
+TRY_LOCK_SQL = "SELECT pg_try_advisory_lock(hashtext('pulse_migration_v002'))"
+LOCK_SQL = "SELECT pg_advisory_lock(hashtext('pulse_migration_v002'))"
+UNLOCK_SQL = "SELECT pg_advisory_unlock(hashtext('pulse_migration_v002'))"
+
+
+# Every column this migration inspects, fetched in one catalog query
+COLUMNS_QUERY = """
+    SELECT table_name, column_name, character_maximum_length
+    FROM information_schema.columns
+    WHERE table_name IN ('profiles', 'posts', 'profile_history', 'post_history', 'alert_logs')
+"""
+
+
+def load_columns(conn) -> dict:
+    """Return {(table, column): character_maximum_length} for the migrated tables."""
+    result = conn.exec_driver_sql(COLUMNS_QUERY)
+    return {(table, column): length for table, column, length in result}
+
+
+# Enum types and constraints this migration creates or drops, checked in one query
+ENUM_TYPES = {
+    "platform_type": "('tiktok', 'twitter', 'reddit')",
+    "user_role_type": "('creator', 'moderator', 'power_user', 'brand')",
+}
+
+LEGACY_CONSTRAINTS = [
+    ("profiles", "profiles_username_key"),
+    ("profiles", "profiles_tiktok_user_id_key"),
+    ("posts", "posts_tiktok_post_id_key"),
+]
+
+UNIQUE_CONSTRAINTS = [
+    ("profiles", "uq_profile_username_platform", "username, platform"),
+    ("profiles", "uq_profile_platform_id", "platform_user_id, platform"),
+    ("posts", "uq_post_platform_id", "platform_post_id, platform"),
+]
+
+EXISTING_OBJECTS_QUERY = """
+    SELECT typname FROM pg_type
+    WHERE typname IN ('platform_type', 'user_role_type')
+    UNION ALL
+    SELECT conname FROM pg_constraint
+    WHERE conrelid IN ('profiles'::regclass, 'posts'::regclass)
+"""
+
+
+def load_existing_objects(conn) -> set:
+    """Return the names of enum types and profiles/posts constraints already present."""
+    result = conn.exec_driver_sql(EXISTING_OBJECTS_QUERY)
+    return {name for (name,) in result}
+
+
+def add_columns_sql(table: str, columns: list) -> str:
+    """Build a single ALTER TABLE statement adding all columns at once."""
+    actions = [f"ADD COLUMN IF NOT EXISTS {name} {ddl}" for name, ddl in columns]
+    return f"ALTER TABLE {table} " + ", ".join(actions)
+
+
+def drop_columns_sql(table: str, columns: list) -> str:
+    """Build a single ALTER TABLE statement dropping all columns at once."""
+    actions = [f"DROP COLUMN IF EXISTS {name}" for name, _ in columns]
+    return f"ALTER TABLE {table} " + ", ".join(actions)
+
+
 def get_database_url() -> str:
     """Get database URL from environment."""
     database_url = os.getenv("DATABASE_URL", "")
@@ -51,12 +191,25 @@ def get_database_url() -> str:
     return database_url
 
 
-def run_migration():
-    """Execute the database migration."""
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Lock waits are bounded by lock_timeout; on a timeout the whole transaction
+    is rolled back and retried with backoff.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
+    return run_with_lock_retry(_run_migration, engine)
+
+
+def _run_migration(engine=None):
+    """Single attempt at the migration (see run_migration)."""
     
     try:
-        from sqlalchemy import create_engine, text
-        from sqlalchemy.orm import sessionmaker
+        import sqlalchemy  # noqa: F401
     except ImportError:
         logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
         sys.exit(1)
@@ -65,335 +218,158 @@ def run_migration():
     logger.info("🔄 Starting migration v0.0.2 - Multi-Platform Support")
     logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
     
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    if engine is None:
+        # Standalone run: skip building an engine when there's nothing to do
+        if fast_probe(database_url, APPLIED_PROBE_SQL):
+            logger.info("✅ Migration already applied (platform column exists)")
+            return True
+        engine = get_engine(database_url)
+    
+    conn = engine.connect()
+    trans = conn.begin()
+    locked = False
     
     try:
         # Check current state
         logger.info("📋 Checking current database state...")
         
-        result = session.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'profiles' AND column_name = 'platform'
-        """))
+        cols = load_columns(conn)
         
-        if result.fetchone():
+        if ("profiles", "platform") in cols:
             logger.info("✅ Migration already applied (platform column exists)")
             return True
         
+        # Only one worker applies the migration; others wait, then re-check
+        locked = conn.exec_driver_sql(TRY_LOCK_SQL).scalar()
+        if not locked:
+            logger.info("⏳ Another worker is applying v0.0.2 - waiting for it to finish...")
+            conn.exec_driver_sql(LOCK_SQL)
+            locked = True
+            
+            cols = load_columns(conn)
+            if ("profiles", "platform") in cols:
+                logger.info("✅ Migration applied by another worker")
+                return True
+        
+        # Legacy TikTok columns decide whether steps 3/5 rename or add
+        has_tiktok_user_id = ("profiles", "tiktok_user_id") in cols
+        has_tiktok_post_id = ("posts", "tiktok_post_id") in cols
+        
+        # Enum types and constraints that already exist are skipped, not trapped
+        existing = load_existing_objects(conn)
+        
         logger.info("🚀 Applying migration...")
+        set_local_timeouts(conn)
+        
+        stmts = []
         
         # =================================================================
         # STEP 1: Create ENUM types
         # =================================================================
-        logger.info("  [1/8] Creating enum types...")
-        
-        session.execute(text("""
-            DO $$ BEGIN
-                CREATE TYPE platform_type AS ENUM ('tiktok', 'twitter', 'reddit');
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """))
-        
-        session.execute(text("""
-            DO $$ BEGIN
-                CREATE TYPE user_role_type AS ENUM ('creator', 'moderator', 'power_user', 'brand');
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """))
-        
-        session.commit()
+        logger.info("  [1/9] Creating enum types...")
+        
+        for type_name, labels in ENUM_TYPES.items():
+            if type_name not in existing:
+                stmts.append(f"CREATE TYPE {type_name} AS ENUM {labels}")
         
         # =================================================================
         # STEP 2: Add platform columns to profiles table
         # =================================================================
-        logger.info("  [2/8] Adding columns to profiles table...")
-        
-        # Add platform column
-        session.execute(text("""
-            ALTER TABLE profiles 
-            ADD COLUMN IF NOT EXISTS platform platform_type DEFAULT 'tiktok'
-        """))
-        
-        # Add user_role column
-        session.execute(text("""
-            ALTER TABLE profiles 
-            ADD COLUMN IF NOT EXISTS user_role user_role_type DEFAULT 'creator'
-        """))
-        
-        # Add Reddit-specific columns
-        session.execute(text("""
-            ALTER TABLE profiles 
-            ADD COLUMN IF NOT EXISTS subreddit_name VARCHAR(128)
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE profiles 
-            ADD COLUMN IF NOT EXISTS subreddit_subscribers BIGINT
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE profiles 
-            ADD COLUMN IF NOT EXISTS active_users INTEGER
-        """))
-        
-        session.commit()
+        logger.info("  [2/9] Adding columns to profiles table...")
+        
+        stmts.append(add_columns_sql("profiles", PROFILE_COLUMNS))
         
         # =================================================================
         # STEP 3: Rename tiktok_user_id to platform_user_id
         # =================================================================
-        logger.info("  [3/8] Renaming tiktok_user_id to platform_user_id...")
-        
-        # Check if old column exists
-        result = session.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'profiles' AND column_name = 'tiktok_user_id'
-        """))
-        
-        if result.fetchone():
-            session.execute(text("""
-                ALTER TABLE profiles 
-                RENAME COLUMN tiktok_user_id TO platform_user_id
-            """))
-            session.commit()
+        logger.info("  [3/9] Renaming tiktok_user_id to platform_user_id...")
+        
+        if has_tiktok_user_id:
+            stmts.append("ALTER TABLE profiles RENAME COLUMN tiktok_user_id TO platform_user_id")
         else:
             # Column might already be renamed or doesn't exist
-            session.execute(text("""
-                ALTER TABLE profiles 
-                ADD COLUMN IF NOT EXISTS platform_user_id VARCHAR(64)
-            """))
-            session.commit()
+            stmts.append("ALTER TABLE profiles ADD COLUMN IF NOT EXISTS platform_user_id VARCHAR(64)")
         
         # =================================================================
         # STEP 4: Add columns to posts table
         # =================================================================
-        logger.info("  [4/8] Adding columns to posts table...")
-        
-        # Add platform column
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS platform platform_type DEFAULT 'tiktok'
-        """))
-        
-        # Twitter-specific columns
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS retweet_count BIGINT
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS quote_count BIGINT
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS bookmark_count BIGINT
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS impression_count BIGINT
-        """))
-        
-        # Reddit-specific columns
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS upvote_ratio FLOAT
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS is_crosspost BOOLEAN
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS original_subreddit VARCHAR(128)
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE posts 
-            ADD COLUMN IF NOT EXISTS reddit_score INTEGER
-        """))
-        
-        session.commit()
+        logger.info("  [4/9] Adding columns to posts table...")
+        
+        stmts.append(add_columns_sql("posts", POST_COLUMNS))
         
         # =================================================================
         # STEP 5: Rename tiktok_post_id to platform_post_id
         # =================================================================
-        logger.info("  [5/8] Renaming tiktok_post_id to platform_post_id...")
-        
-        result = session.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'posts' AND column_name = 'tiktok_post_id'
-        """))
-        
-        if result.fetchone():
-            session.execute(text("""
-                ALTER TABLE posts 
-                RENAME COLUMN tiktok_post_id TO platform_post_id
-            """))
-            session.commit()
+        logger.info("  [5/9] Renaming tiktok_post_id to platform_post_id...")
+        
+        if has_tiktok_post_id:
+            stmts.append("ALTER TABLE posts RENAME COLUMN tiktok_post_id TO platform_post_id")
         else:
-            session.execute(text("""
-                ALTER TABLE posts 
-                ADD COLUMN IF NOT EXISTS platform_post_id VARCHAR(64)
-            """))
-            session.commit()
+            stmts.append("ALTER TABLE posts ADD COLUMN IF NOT EXISTS platform_post_id VARCHAR(64)")
         
         # =================================================================
         # STEP 6: Add columns to profile_history table
         # =================================================================
-        logger.info("  [6/8] Adding columns to profile_history table...")
-        
-        session.execute(text("""
-            ALTER TABLE profile_history 
-            ADD COLUMN IF NOT EXISTS subreddit_subscribers BIGINT
-        """))
+        logger.info("  [6/9] Adding columns to profile_history table...")
         
-        session.execute(text("""
-            ALTER TABLE profile_history 
-            ADD COLUMN IF NOT EXISTS active_users INTEGER
-        """))
-        
-        session.commit()
+        stmts.append(add_columns_sql("profile_history", PROFILE_HISTORY_COLUMNS))
         
         # =================================================================
         # STEP 7: Add columns to post_history table
         # =================================================================
-        logger.info("  [7/8] Adding columns to post_history table...")
-        
-        session.execute(text("""
-            ALTER TABLE post_history 
-            ADD COLUMN IF NOT EXISTS retweet_count BIGINT
-        """))
+        logger.info("  [7/9] Adding columns to post_history table...")
         
-        session.execute(text("""
-            ALTER TABLE post_history 
-            ADD COLUMN IF NOT EXISTS quote_count BIGINT
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE post_history 
-            ADD COLUMN IF NOT EXISTS upvote_ratio FLOAT
-        """))
-        
-        session.execute(text("""
-            ALTER TABLE post_history 
-            ADD COLUMN IF NOT EXISTS reddit_score INTEGER
-        """))
-        
-        session.commit()
+        stmts.append(add_columns_sql("post_history", POST_HISTORY_COLUMNS))
         
         # =================================================================
         # STEP 8: Add platform column to alert_logs
         # =================================================================
-        logger.info("  [8/8] Adding platform column to alert_logs...")
-        
-        session.execute(text("""
-            ALTER TABLE alert_logs 
-            ADD COLUMN IF NOT EXISTS platform platform_type
-        """))
+        logger.info("  [8/9] Adding platform column to alert_logs...")
         
-        session.commit()
+        stmts.append("ALTER TABLE alert_logs ADD COLUMN IF NOT EXISTS platform platform_type")
         
         # =================================================================
         # STEP 9: Update constraints and indexes
         # =================================================================
         logger.info("  [9/9] Updating constraints and indexes...")
         
-        # Drop old unique constraint on username if it exists
-        session.execute(text("""
-            DO $$ BEGIN
-                ALTER TABLE profiles DROP CONSTRAINT IF EXISTS profiles_username_key;
-            EXCEPTION
-                WHEN undefined_object THEN null;
-            END $$;
-        """))
-        
-        # Drop old unique constraint on tiktok_user_id if it exists
-        session.execute(text("""
-            DO $$ BEGIN
-                ALTER TABLE profiles DROP CONSTRAINT IF EXISTS profiles_tiktok_user_id_key;
-            EXCEPTION
-                WHEN undefined_object THEN null;
-            END $$;
-        """))
-        
-        # Drop old unique constraint on tiktok_post_id if it exists
-        session.execute(text("""
-            DO $$ BEGIN
-                ALTER TABLE posts DROP CONSTRAINT IF EXISTS posts_tiktok_post_id_key;
-            EXCEPTION
-                WHEN undefined_object THEN null;
-            END $$;
-        """))
+        # Drop old single-platform unique constraints if they exist
+        for table, constraint in LEGACY_CONSTRAINTS:
+            if constraint in existing:
+                stmts.append(f"ALTER TABLE {table} DROP CONSTRAINT {constraint}")
         
         # Add new composite unique constraints
-        session.execute(text("""
-            DO $$ BEGIN
-                ALTER TABLE profiles 
-                ADD CONSTRAINT uq_profile_username_platform UNIQUE (username, platform);
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """))
-        
-        session.execute(text("""
-            DO $$ BEGIN
-                ALTER TABLE profiles 
-                ADD CONSTRAINT uq_profile_platform_id UNIQUE (platform_user_id, platform);
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """))
-        
-        session.execute(text("""
-            DO $$ BEGIN
-                ALTER TABLE posts 
-                ADD CONSTRAINT uq_post_platform_id UNIQUE (platform_post_id, platform);
-            EXCEPTION
-                WHEN duplicate_object THEN null;
-            END $$;
-        """))
-        
-        # Create new indexes
-        session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_profiles_platform ON profiles(platform)
-        """))
-        
-        session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_profiles_active_platform ON profiles(is_active, platform)
-        """))
-        
-        session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts(platform)
-        """))
-        
-        session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_alert_logs_platform ON alert_logs(platform)
-        """))
-        
-        session.commit()
+        for table, constraint, columns in UNIQUE_CONSTRAINTS:
+            if constraint not in existing:
+                stmts.append(f"ALTER TABLE {table} ADD CONSTRAINT {constraint} UNIQUE ({columns})")
+        
+        # Send every statement without waiting for a round-trip per statement
+        logger.info(f"  📤 Executing {len(stmts)} statements as a single batch...")
+        execute_batch(conn, stmts)
+        
+        # Commit every step in a single transaction (Postgres DDL is transactional)
+        trans.commit()
+        
+        # Release the lock before the concurrent index builds. A worker blocked
+        # in LOCK_SQL holds a snapshot that CREATE INDEX CONCURRENTLY waits
+        # for, while it waits on this lock - a cycle Postgres can't detect.
+        # Waiters now see the committed columns and return; the builds are
+        # idempotent (IF NOT EXISTS, invalid indexes rebuilt).
+        conn.exec_driver_sql(UNLOCK_SQL)
+        locked = False
+        
+        # Create new indexes outside the transaction so writes aren't blocked
+        create_indexes_concurrently(engine, INDEXES)
         
         # =================================================================
         # VERIFY MIGRATION
         # =================================================================
         logger.info("📊 Verifying migration...")
         
-        # Count existing records
-        result = session.execute(text("SELECT COUNT(*) FROM profiles WHERE platform = 'tiktok'"))
-        profile_count = result.scalar()
-        
-        result = session.execute(text("SELECT COUNT(*) FROM posts WHERE platform = 'tiktok'"))
-        post_count = result.scalar()
+        # Count existing records (one round-trip, one snapshot)
+        counts = dict(conn.exec_driver_sql(VERIFY_COUNTS_QUERY).fetchall())
+        profile_count = counts["profiles"]
+        post_count = counts["posts"]
         
         logger.info(f"   ✅ Profiles migrated: {profile_count}")
         logger.info(f"   ✅ Posts migrated: {post_count}")
@@ -404,74 +380,56 @@ def run_migration():
         return True
         
     except Exception as e:
-        session.rollback()
+        if trans.is_active:
+            trans.rollback()
         logger.error(f"❌ Migration failed: {e}")
         raise
     finally:
-        session.close()
+        if locked:
+            # Clear any failed transaction so the unlock can run
+            conn.rollback()
+            conn.exec_driver_sql(UNLOCK_SQL)
+        conn.close()
 
 
 def rollback_migration():
     """Rollback the migration (for development/testing only)."""
     
-    from sqlalchemy import create_engine, text
-    from sqlalchemy.orm import sessionmaker
-    
     database_url = get_database_url()
     logger.warning("⚠️ Rolling back migration v0.0.2...")
     
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    engine = get_engine(database_url)
+    conn = engine.connect()
+    trans = conn.begin()
     
     try:
         # This is a simplified rollback - in production, you'd want more careful handling
+        cols = load_columns(conn)
         
         # Drop new columns from profiles
-        session.execute(text("ALTER TABLE profiles DROP COLUMN IF EXISTS platform"))
-        session.execute(text("ALTER TABLE profiles DROP COLUMN IF EXISTS user_role"))
-        session.execute(text("ALTER TABLE profiles DROP COLUMN IF EXISTS subreddit_name"))
-        session.execute(text("ALTER TABLE profiles DROP COLUMN IF EXISTS subreddit_subscribers"))
-        session.execute(text("ALTER TABLE profiles DROP COLUMN IF EXISTS active_users"))
+        conn.exec_driver_sql(drop_columns_sql("profiles", PROFILE_COLUMNS))
         
         # Rename platform_user_id back to tiktok_user_id
-        result = session.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'profiles' AND column_name = 'platform_user_id'
-        """))
-        if result.fetchone():
-            session.execute(text("ALTER TABLE profiles RENAME COLUMN platform_user_id TO tiktok_user_id"))
+        if ("profiles", "platform_user_id") in cols:
+            conn.exec_driver_sql("ALTER TABLE profiles RENAME COLUMN platform_user_id TO tiktok_user_id")
         
         # Drop new columns from posts
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS platform"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS retweet_count"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS quote_count"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS bookmark_count"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS impression_count"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS upvote_ratio"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS is_crosspost"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS original_subreddit"))
-        session.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS reddit_score"))
+        conn.exec_driver_sql(drop_columns_sql("posts", POST_COLUMNS))
         
         # Rename platform_post_id back to tiktok_post_id
-        result = session.execute(text("""
-            SELECT column_name 
-            FROM information_schema.columns 
-            WHERE table_name = 'posts' AND column_name = 'platform_post_id'
-        """))
-        if result.fetchone():
-            session.execute(text("ALTER TABLE posts RENAME COLUMN platform_post_id TO tiktok_post_id"))
-        
-        session.commit()
+        if ("posts", "platform_post_id") in cols:
+            conn.exec_driver_sql("ALTER TABLE posts RENAME COLUMN platform_post_id TO tiktok_post_id")
+        
+        trans.commit()
         logger.info("✅ Rollback completed")
         
     except Exception as e:
-        session.rollback()
+        if trans.is_active:
+            trans.rollback()
         logger.error(f"❌ Rollback failed: {e}")
         raise
     finally:
-        session.close()
+        conn.close()
 
 
 if __name__ == "__main__":
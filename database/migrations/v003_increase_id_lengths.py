@@ -25,6 +25,8 @@ import sys
 import logging
 from datetime import datetime
 
+from database.migrations.helpers import fast_probe, get_engine
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,12 +52,69 @@ def get_database_url() -> str:
     return database_url
 
 
-def run_migration():
-    """Execute the database migration."""
+TARGET_LENGTH = 255
+
+# ID columns to widen per table (legacy tiktok_* columns may not exist)
+ID_COLUMNS = {
+    "profiles": ["platform_user_id", "tiktok_user_id"],
+    "posts": ["platform_post_id", "tiktok_post_id"],
+}
+
+# Fast-path "already applied" probe for standalone runs
+APPLIED_PROBE_SQL = f"""
+    SELECT NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name IN ('profiles', 'posts')
+        AND column_name IN ('platform_user_id', 'tiktok_user_id', 'platform_post_id', 'tiktok_post_id')
+        AND character_maximum_length < {TARGET_LENGTH}
+    )
+"""
+
+# Every ID column this migration touches, fetched in one catalog query
+COLUMNS_QUERY = """
+    SELECT table_name, column_name, character_maximum_length
+    FROM information_schema.columns
+    WHERE table_name IN ('profiles', 'posts')
+    AND column_name IN ('platform_user_id', 'tiktok_user_id', 'platform_post_id', 'tiktok_post_id')
+"""
+
+
+# ID column widths read straight from pg_attribute (atttypmod for VARCHAR(n) is n + 4)
+ID_ATTRIBUTES = """
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    WHERE c.relname IN ('profiles', 'posts')
+    AND a.attname IN ('platform_user_id', 'tiktok_user_id', 'platform_post_id', 'tiktok_post_id')
+    AND NOT a.attisdropped
+"""
+
+# Happy path: a single scalar counting columns still narrower than the target
+VERIFY_COUNT_QUERY = "SELECT COUNT(*) FILTER (WHERE a.atttypmod - 4 < %(target)s)" + ID_ATTRIBUTES
+
+# Only run when the count is non-zero, to report which columns are short
+VERIFY_DETAIL_QUERY = (
+    "SELECT c.relname, a.attname, a.atttypmod - 4" + ID_ATTRIBUTES
+    + "    AND a.atttypmod - 4 < %(target)s\n    ORDER BY c.relname, a.attname"
+)
+
+
+def load_columns(conn) -> dict:
+    """Return {(table, column): character_maximum_length} for the ID columns."""
+    result = conn.exec_driver_sql(COLUMNS_QUERY)
+    return {(table, column): length for table, column, length in result}
+
+
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
 
     try:
-        from sqlalchemy import create_engine, text
-        from sqlalchemy.orm import sessionmaker
+        import sqlalchemy  # noqa: F401
     except ImportError:
         logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
         sys.exit(1)
@@ -64,121 +123,70 @@ def run_migration():
     logger.info("🔄 Starting migration v0.0.3 - Increase ID Column Lengths")
     logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
 
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    if engine is None:
+        # Standalone run: skip building an engine when there's nothing to do
+        if fast_probe(database_url, APPLIED_PROBE_SQL):
+            logger.info(f"✅ Migration already applied (ID columns are already VARCHAR({TARGET_LENGTH}) or larger)")
+            return True
+        engine = get_engine(database_url)
+
+    conn = engine.connect()
+    trans = conn.begin()
 
     try:
         # Check current state
         logger.info("📋 Checking current database state...")
 
-        # Check if columns already have the correct size
-        result = session.execute(text("""
-            SELECT character_maximum_length
-            FROM information_schema.columns
-            WHERE table_name = 'profiles'
-            AND column_name = 'platform_user_id'
-        """))
-
-        current_length = result.scalar()
-
-        if current_length and current_length >= 255:
-            logger.info("✅ Migration already applied (platform_user_id is already VARCHAR(255) or larger)")
+        # Check which columns still need widening (per column, so a partial
+        # earlier run or a fresh install without legacy columns is handled)
+        cols = load_columns(conn)
+        pending = {
+            table: [
+                column for column in columns
+                if cols.get((table, column)) is not None and cols[(table, column)] < TARGET_LENGTH
+            ]
+            for table, columns in ID_COLUMNS.items()
+        }
+
+        if not any(pending.values()):
+            logger.info(f"✅ Migration already applied (ID columns are already VARCHAR({TARGET_LENGTH}) or larger)")
             return True
 
-        logger.info(f"📏 Current platform_user_id length: {current_length}")
+        logger.info(f"📏 Current platform_user_id length: {cols.get(('profiles', 'platform_user_id'))}")
         logger.info("🚀 Applying migration...")
 
         # =================================================================
-        # STEP 1: Increase profiles table ID column sizes
-        # =================================================================
-        logger.info("  [1/4] Increasing profiles.platform_user_id to VARCHAR(255)...")
-
-        session.execute(text("""
-            ALTER TABLE profiles
-            ALTER COLUMN platform_user_id TYPE VARCHAR(255)
-        """))
-
-        session.commit()
-
-        # =================================================================
-        # STEP 2: Increase profiles.tiktok_user_id (legacy column)
-        # =================================================================
-        logger.info("  [2/4] Increasing profiles.tiktok_user_id to VARCHAR(255)...")
-
-        # Check if column exists first (it might not in fresh installs)
-        result = session.execute(text("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = 'profiles' AND column_name = 'tiktok_user_id'
-        """))
-
-        if result.fetchone():
-            session.execute(text("""
-                ALTER TABLE profiles
-                ALTER COLUMN tiktok_user_id TYPE VARCHAR(255)
-            """))
-            session.commit()
-            logger.info("     ✅ tiktok_user_id column updated")
-        else:
-            logger.info("     ℹ️  tiktok_user_id column doesn't exist (skipping)")
-
-        # =================================================================
-        # STEP 3: Increase posts.platform_post_id
+        # Widen ID columns - one ALTER TABLE per table
         # =================================================================
-        logger.info("  [3/4] Increasing posts.platform_post_id to VARCHAR(255)...")
-
-        session.execute(text("""
-            ALTER TABLE posts
-            ALTER COLUMN platform_post_id TYPE VARCHAR(255)
-        """))
+        # Widening VARCHAR(n) to a larger n is a catalog-only change in
+        # PostgreSQL 9.2+ (no table rewrite), so the ALTERs are quick and
+        # there's nothing to gain from running the two tables in parallel.
+        for step, (table, columns) in enumerate(pending.items(), start=1):
+            logger.info(f"  [{step}/{len(pending)}] Increasing {table} ID columns to VARCHAR({TARGET_LENGTH})...")
 
-        session.commit()
+            if not columns:
+                logger.info("     ℹ️  Nothing to widen (skipping)")
+                continue
 
-        # =================================================================
-        # STEP 4: Increase posts.tiktok_post_id (legacy column)
-        # =================================================================
-        logger.info("  [4/4] Increasing posts.tiktok_post_id to VARCHAR(255)...")
+            actions = [f"ALTER COLUMN {column} TYPE VARCHAR({TARGET_LENGTH})" for column in columns]
+            conn.exec_driver_sql(f"ALTER TABLE {table} " + ", ".join(actions))
+            logger.info(f"     ✅ Updated: {', '.join(columns)}")
 
-        # Check if column exists first
-        result = session.execute(text("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = 'posts' AND column_name = 'tiktok_post_id'
-        """))
-
-        if result.fetchone():
-            session.execute(text("""
-                ALTER TABLE posts
-                ALTER COLUMN tiktok_post_id TYPE VARCHAR(255)
-            """))
-            session.commit()
-            logger.info("     ✅ tiktok_post_id column updated")
-        else:
-            logger.info("     ℹ️  tiktok_post_id column doesn't exist (skipping)")
+        # Commit all column changes in a single transaction
+        trans.commit()
 
         # =================================================================
         # VERIFY MIGRATION
         # =================================================================
         logger.info("📊 Verifying migration...")
 
-        # Verify all columns are now 255
-        result = session.execute(text("""
-            SELECT
-                column_name,
-                character_maximum_length
-            FROM information_schema.columns
-            WHERE table_name IN ('profiles', 'posts')
-            AND column_name IN ('platform_user_id', 'tiktok_user_id', 'platform_post_id', 'tiktok_post_id')
-            ORDER BY table_name, column_name
-        """))
-
-        columns = result.fetchall()
-        for column_name, max_length in columns:
-            if max_length == 255:
-                logger.info(f"   ✅ {column_name}: VARCHAR({max_length})")
-            else:
-                logger.warning(f"   ⚠️  {column_name}: VARCHAR({max_length}) (expected 255)")
+        # Verify all columns are now 255 (one pg_attribute read, no per-column queries)
+        params = {"target": TARGET_LENGTH}
+        if conn.exec_driver_sql(VERIFY_COUNT_QUERY, params).scalar():
+            for table, column_name, max_length in conn.exec_driver_sql(VERIFY_DETAIL_QUERY, params):
+                logger.warning(f"   ⚠️  {table}.{column_name}: VARCHAR({max_length}) (expected {TARGET_LENGTH})")
+        else:
+            logger.info(f"   ✅ All ID columns are VARCHAR({TARGET_LENGTH})")
 
         logger.info("🎉 Migration v0.0.3 completed successfully!")
         logger.info("   All ID columns can now store secUid values up to 255 characters")
@@ -186,76 +194,67 @@ def run_migration():
         return True
 
     except Exception as e:
-        session.rollback()
+        if trans.is_active:
+            trans.rollback()
         logger.error(f"❌ Migration failed: {e}")
         raise
     finally:
-        session.close()
+        conn.close()
 
 
 def rollback_migration():
     """Rollback the migration (for development/testing only)."""
 
-    from sqlalchemy import create_engine, text
-    from sqlalchemy.orm import sessionmaker
-
     database_url = get_database_url()
     logger.warning("⚠️ Rolling back migration v0.0.3...")
     logger.warning("⚠️ WARNING: This will truncate ID columns back to VARCHAR(64)")
     logger.warning("⚠️ Any existing values longer than 64 characters will cause errors!")
 
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    engine = get_engine(database_url)
+    conn = engine.connect()
+    trans = conn.begin()
 
     try:
+        cols = load_columns(conn)
+
         # Reduce column sizes back to 64
         logger.info("  [1/4] Reducing profiles.platform_user_id to VARCHAR(64)...")
-        session.execute(text("""
+        conn.exec_driver_sql("""
             ALTER TABLE profiles
             ALTER COLUMN platform_user_id TYPE VARCHAR(64)
-        """))
+        """)
 
         logger.info("  [2/4] Reducing profiles.tiktok_user_id to VARCHAR(64)...")
-        result = session.execute(text("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = 'profiles' AND column_name = 'tiktok_user_id'
-        """))
-        if result.fetchone():
-            session.execute(text("""
+        if ("profiles", "tiktok_user_id") in cols:
+            conn.exec_driver_sql("""
                 ALTER TABLE profiles
                 ALTER COLUMN tiktok_user_id TYPE VARCHAR(64)
-            """))
+            """)
 
         logger.info("  [3/4] Reducing posts.platform_post_id to VARCHAR(64)...")
-        session.execute(text("""
+        conn.exec_driver_sql("""
             ALTER TABLE posts
             ALTER COLUMN platform_post_id TYPE VARCHAR(64)
-        """))
+        """)
 
         logger.info("  [4/4] Reducing posts.tiktok_post_id to VARCHAR(64)...")
-        result = session.execute(text("""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = 'posts' AND column_name = 'tiktok_post_id'
-        """))
-        if result.fetchone():
-            session.execute(text("""
+        if ("posts", "tiktok_post_id") in cols:
+            conn.exec_driver_sql("""
                 ALTER TABLE posts
                 ALTER COLUMN tiktok_post_id TYPE VARCHAR(64)
-            """))
+            """)
 
-        session.commit()
+        trans.commit()
         logger.info("✅ Rollback completed")
 
     except Exception as e:
-        session.rollback()
+        if trans.is_active:
+            trans.rollback()
         logger.error(f"❌ Rollback failed: {e}")
         logger.error("This is likely because existing data exceeds 64 characters")
         raise
     finally:
-        session.close()
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -21,6 +21,13 @@ import sys
 import logging
 from datetime import datetime
 
+from database.migrations.helpers import (
+    create_indexes_concurrently,
+    get_engine,
+    session_advisory_lock,
+    xact_advisory_lock,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,12 +53,52 @@ def get_database_url() -> str:
     return database_url
 
 
-def run_migration():
-    """Execute the database migration."""
+# Plain SQL strings run with exec_driver_sql(): no text() construct to build
+# or compile, and nothing is re-created per call
+TABLE_EXISTS_SQL = "SELECT to_regclass('subreddit_traffic')"
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS subreddit_traffic (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        subreddit_name VARCHAR(128) NOT NULL,
+        timestamp DATE NOT NULL,
+        unique_visitors INTEGER DEFAULT 0,
+        pageviews INTEGER DEFAULT 0,
+        subscriptions INTEGER DEFAULT 0,
+        created_at TIMESTAMPTZ DEFAULT now(),
+        updated_at TIMESTAMPTZ DEFAULT now(),
+        CONSTRAINT uq_subreddit_traffic_date UNIQUE (subreddit_name, timestamp)
+    )
+"""
+
+VERIFY_COLUMNS_QUERY = """
+    SELECT attname, format_type(atttypid, atttypmod)
+    FROM pg_attribute
+    WHERE attrelid = to_regclass('subreddit_traffic')
+    AND attnum > 0
+    AND NOT attisdropped
+    ORDER BY attnum
+"""
+
+# Indexes built with CREATE INDEX CONCURRENTLY after the table transaction commits
+INDEXES = {
+    # BRIN: rows arrive in date order, so min/max per page range is enough
+    "idx_subreddit_traffic_timestamp": "ON subreddit_traffic USING brin (timestamp) WITH (pages_per_range = 32)",
+    "idx_subreddit_traffic_lookup": "ON subreddit_traffic(subreddit_name, timestamp DESC)",
+}
+
+
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
 
     try:
-        from sqlalchemy import create_engine, text
-        from sqlalchemy.orm import sessionmaker
+        import sqlalchemy  # noqa: F401
     except ImportError:
         logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
         sys.exit(1)
@@ -60,82 +107,60 @@ def run_migration():
     logger.info("🔄 Starting migration v0.0.4 - Subreddit Traffic Analytics")
     logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
 
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    engine = engine or get_engine(database_url)
 
     try:
-        # Check if table already exists
-        logger.info("📋 Checking current database state...")
+        with engine.begin() as conn:
+            # Parallel deploy workers queue here; the loser then sees the table
+            xact_advisory_lock(conn, "pulse_migration_v004")
 
-        result = session.execute(text("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_name = 'subreddit_traffic'
-        """))
+            # Check if table already exists
+            logger.info("📋 Checking current database state...")
 
-        if result.fetchone():
-            logger.info("✅ Migration already applied (subreddit_traffic table exists)")
-            return True
+            # to_regclass is a syscache lookup, unlike the information_schema views
+            result = conn.exec_driver_sql(TABLE_EXISTS_SQL)
 
-        logger.info("🚀 Applying migration...")
+            table_exists = result.scalar() is not None
 
-        # =================================================================
-        # STEP 1: Create subreddit_traffic table
-        # =================================================================
-        logger.info("  [1/2] Creating subreddit_traffic table...")
-
-        session.execute(text("""
-            CREATE TABLE IF NOT EXISTS subreddit_traffic (
-                id SERIAL PRIMARY KEY,
-                subreddit_name VARCHAR(128) NOT NULL,
-                timestamp DATE NOT NULL,
-                unique_visitors INTEGER DEFAULT 0,
-                pageviews INTEGER DEFAULT 0,
-                subscriptions INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                CONSTRAINT uq_subreddit_traffic_date UNIQUE (subreddit_name, timestamp)
-            )
-        """))
-
-        session.commit()
+            if table_exists:
+                logger.info("✅ subreddit_traffic table exists - checking its indexes")
+            else:
+                logger.info("🚀 Applying migration...")
+
+                # =========================================================
+                # STEP 1: Create subreddit_traffic table
+                # =========================================================
+                logger.info("  [1/2] Creating subreddit_traffic table...")
+
+                conn.exec_driver_sql(CREATE_TABLE_SQL)
 
         # =================================================================
         # STEP 2: Create indexes for efficient queries
         # =================================================================
+        # Built outside the table transaction with CREATE INDEX CONCURRENTLY
+        # so re-runs against a populated table never block writers. Also run
+        # when the table already exists: a build interrupted after the table
+        # committed leaves an INVALID index that only this step repairs. The
+        # session lock keeps parallel workers from dropping each other's
+        # in-progress builds as "invalid".
         logger.info("  [2/2] Creating indexes...")
 
-        session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_subreddit_traffic_subreddit
-            ON subreddit_traffic(subreddit_name)
-        """))
+        with session_advisory_lock(engine, "pulse_migration_v004_indexes"):
+            create_indexes_concurrently(engine, INDEXES)
 
-        session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_subreddit_traffic_timestamp
-            ON subreddit_traffic(timestamp DESC)
-        """))
-
-        session.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_subreddit_traffic_lookup
-            ON subreddit_traffic(subreddit_name, timestamp DESC)
-        """))
-
-        session.commit()
+        if table_exists:
+            logger.info("✅ Migration already applied (subreddit_traffic table and indexes exist)")
+            return True
 
         # =================================================================
         # VERIFY MIGRATION
         # =================================================================
         logger.info("📊 Verifying migration...")
 
-        result = session.execute(text("""
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_name = 'subreddit_traffic'
-            ORDER BY ordinal_position
-        """))
+        with engine.connect() as conn:
+            result = conn.exec_driver_sql(VERIFY_COLUMNS_QUERY)
+            columns = result.fetchall()
 
-        columns = result.fetchall()
         logger.info(f"   ✅ Table created with {len(columns)} columns:")
         for col in columns:
             logger.info(f"      - {col[0]} ({col[1]})")
@@ -145,37 +170,26 @@ def run_migration():
         return True
 
     except Exception as e:
-        session.rollback()
         logger.error(f"❌ Migration failed: {e}")
         raise
-    finally:
-        session.close()
 
 
 def rollback_migration():
     """Rollback the migration (for development/testing only)."""
 
-    from sqlalchemy import create_engine, text
-    from sqlalchemy.orm import sessionmaker
-
     database_url = get_database_url()
     logger.warning("⚠️ Rolling back migration v0.0.4...")
 
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    engine = get_engine(database_url)
 
     try:
-        session.execute(text("DROP TABLE IF EXISTS subreddit_traffic CASCADE"))
-        session.commit()
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE IF EXISTS subreddit_traffic CASCADE")
         logger.info("✅ Rollback completed - subreddit_traffic table dropped")
 
     except Exception as e:
-        session.rollback()
         logger.error(f"❌ Rollback failed: {e}")
         raise
-    finally:
-        session.close()
 
 
 if __name__ == "__main__":
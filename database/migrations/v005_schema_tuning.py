@@ -0,0 +1,333 @@
+"""
+Pulse Database Migration - v0.0.5 Schema Tuning
+
+This migration brings the indexes of existing databases in line with the
+SQLAlchemy models. Fresh databases get the same indexes from create_all(),
+so on those it is a no-op.
+
+Changes:
+- Converts subreddit_traffic.timestamp to DATE on databases created from the
+  models while it was still declared as DateTime (v0.0.4 already used DATE)
+- Rebuilds idx_subreddit_traffic_timestamp as a BRIN index (daily rows are
+  appended in timestamp order, so min/max per page range is enough)
+- Drops ix_subreddit_traffic_timestamp (B-tree left by the old index=True)
+- Drops idx_subreddit_traffic_subreddit / ix_subreddit_traffic_subreddit_name
+  (subreddit_name lookups are served by the composite lookup index)
+- Rebuilds idx_profile_history_lookup / idx_post_history_lookup as
+  (id, recorded_at DESC) covering indexes and drops the standalone
+  ix_*_recorded_at indexes
+- Adds BRIN indexes on profile_history / post_history recorded_at for
+  time-range scans and retention purges
+- Rebuilds idx_posts_profile_posted as a (profile_id, posted_at DESC)
+  covering index for per-profile timelines
+- Replaces idx_posts_viral with the partial idx_posts_viral_pending, which
+  only holds posts still waiting on a viral alert
+
+Every index is built or dropped CONCURRENTLY, so writes keep flowing. An
+outdated index is rebuilt under a temporary <name>_new and swapped in
+(drop + rename) only once the replacement is ready, so lookups are never
+left without an index; superseded indexes are dropped last.
+
+Usage:
+    python -m database.migrations.v005_schema_tuning
+
+Environment Variables:
+    DATABASE_URL - PostgreSQL connection string
+"""
+
+import os
+import sys
+import logging
+
+from database.migrations.helpers import (
+    create_indexes_concurrently,
+    get_engine,
+    session_advisory_lock,
+    set_local_timeouts,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# INDEX SPECS
+# =============================================================================
+
+# Index name -> (definition, marker that must appear in pg_indexes.indexdef).
+# An existing index whose definition lacks the marker is dropped and rebuilt.
+INDEXES = {
+    "idx_subreddit_traffic_timestamp": (
+        "ON subreddit_traffic USING brin (timestamp) WITH (pages_per_range = 32)",
+        "USING brin",
+    ),
+    "idx_profile_history_lookup": (
+        "ON profile_history (profile_id, recorded_at DESC) "
+        "INCLUDE (follower_count, following_count, total_likes, video_count, "
+        "follower_change, subreddit_subscribers, active_users)",
+        "INCLUDE",
+    ),
+    "idx_post_history_lookup": (
+        "ON post_history (post_id, recorded_at DESC) "
+        "INCLUDE (view_count, like_count, comment_count, share_count)",
+        "INCLUDE",
+    ),
+    "idx_profile_history_recorded_brin": (
+        "ON profile_history USING brin (recorded_at) WITH (pages_per_range = 64)",
+        "USING brin",
+    ),
+    "idx_post_history_recorded_brin": (
+        "ON post_history USING brin (recorded_at) WITH (pages_per_range = 64)",
+        "USING brin",
+    ),
+    "idx_posts_profile_posted": (
+        "ON posts (profile_id, posted_at DESC) "
+        "INCLUDE (view_count, like_count, comment_count, share_count, is_viral)",
+        "INCLUDE",
+    ),
+    "idx_posts_viral_pending": (
+        "ON posts (profile_id) WHERE is_viral AND NOT viral_alert_sent",
+        "WHERE",
+    ),
+}
+
+# Indexes superseded by the ones above
+OBSOLETE_INDEXES = [
+    "ix_subreddit_traffic_timestamp",
+    # Leading column of idx_subreddit_traffic_lookup / uq_subreddit_traffic_date
+    "idx_subreddit_traffic_subreddit",
+    "ix_subreddit_traffic_subreddit_name",
+    # Covered by the history lookup indexes once profile/post id is filtered
+    "ix_profile_history_recorded_at",
+    "ix_post_history_recorded_at",
+    # Full two-column index over mostly is_viral = false rows
+    "idx_posts_viral",
+]
+
+# Outdated indexes are rebuilt as <name><REBUILD_SUFFIX>, then renamed over
+# the original. A leftover temporary index means a swap was interrupted.
+REBUILD_SUFFIX = "_new"
+
+# Original definitions, restored by --rollback
+ORIGINAL_INDEXES = {
+    "idx_subreddit_traffic_subreddit": "ON subreddit_traffic(subreddit_name)",
+    "idx_subreddit_traffic_timestamp": "ON subreddit_traffic(timestamp DESC)",
+    "idx_profile_history_lookup": "ON profile_history(profile_id, recorded_at)",
+    "idx_post_history_lookup": "ON post_history(post_id, recorded_at)",
+    "idx_posts_viral": "ON posts(is_viral, viral_alert_sent)",
+    "idx_posts_profile_posted": "ON posts(profile_id, posted_at)",
+}
+
+# =============================================================================
+# COLUMN TYPES
+# =============================================================================
+
+TRAFFIC_TIMESTAMP_TYPE_QUERY = """
+    SELECT format_type(a.atttypid, a.atttypmod)
+    FROM pg_attribute a
+    WHERE a.attrelid = to_regclass('subreddit_traffic')
+    AND a.attname = 'timestamp'
+    AND NOT a.attisdropped
+"""
+
+# Traffic rows are stored at midnight, so the cast drops no information
+ALTER_TRAFFIC_TIMESTAMP_SQL = """
+    ALTER TABLE subreddit_traffic
+    ALTER COLUMN timestamp TYPE DATE USING timestamp::date
+"""
+
+EXISTING_INDEXES_QUERY = """
+    SELECT indexname, indexdef
+    FROM pg_indexes
+    WHERE indexname = ANY(%(names)s)
+"""
+
+
+def get_database_url() -> str:
+    """Get database URL from environment."""
+    database_url = os.getenv("DATABASE_URL", "")
+
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable is not set. "
+            "Please set your PostgreSQL connection string."
+        )
+
+    # Railway/Heroku use 'postgres://' but SQLAlchemy requires 'postgresql://'
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    return database_url
+
+
+def load_existing_indexes(conn) -> dict:
+    """Return {index name: indexdef} for every index this migration manages."""
+    names = (
+        list(INDEXES)
+        + [name + REBUILD_SUFFIX for name in INDEXES]
+        + OBSOLETE_INDEXES
+    )
+    result = conn.exec_driver_sql(EXISTING_INDEXES_QUERY, {"names": names})
+    return dict(result.fetchall())
+
+
+def plan_changes(existing: dict) -> tuple:
+    """
+    Work out which indexes to drop, create and rebuild.
+
+    Returns:
+        (to_drop, to_create, to_rebuild): obsolete index names, missing
+        indexes {name: definition}, and outdated (or half-swapped) indexes
+        {name: definition} to rebuild under a temporary name
+    """
+    to_drop = [name for name in OBSOLETE_INDEXES if name in existing]
+    to_create = {}
+    to_rebuild = {}
+
+    for name, (definition, marker) in INDEXES.items():
+        if name + REBUILD_SUFFIX in existing:
+            # Interrupted swap: finish it
+            to_rebuild[name] = definition
+        elif name not in existing:
+            to_create[name] = definition
+        elif marker not in existing[name]:
+            to_rebuild[name] = definition
+
+    return to_drop, to_create, to_rebuild
+
+
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
+
+    try:
+        import sqlalchemy  # noqa: F401
+    except ImportError:
+        logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
+        sys.exit(1)
+
+    database_url = get_database_url()
+    logger.info("🔄 Starting migration v0.0.5 - Schema Tuning")
+    logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
+
+    engine = engine or get_engine(database_url)
+
+    try:
+        # Web and worker run this at the same time. Unserialized, one run's
+        # invalid-index cleanup would drop the other's in-progress build.
+        # The index state is read once the lock is held.
+        with session_advisory_lock(engine, "pulse_migration_v005"):
+            # Check current state
+            logger.info("📋 Checking current database state...")
+
+            with engine.connect() as conn:
+                timestamp_type = conn.exec_driver_sql(TRAFFIC_TIMESTAMP_TYPE_QUERY).scalar()
+                to_drop, to_create, to_rebuild = plan_changes(load_existing_indexes(conn))
+
+            retype_timestamp = timestamp_type not in (None, "date")
+
+            if not retype_timestamp and not to_drop and not to_create and not to_rebuild:
+                logger.info("✅ Migration already applied (indexes match the models)")
+                return True
+
+            logger.info("🚀 Applying migration...")
+
+            # =================================================================
+            # STEP 1: Align column types with the models
+            # =================================================================
+            if retype_timestamp:
+                logger.info(f"  [1/4] Converting subreddit_traffic.timestamp from {timestamp_type} to date...")
+
+                with engine.begin() as conn:
+                    set_local_timeouts(conn)
+                    conn.exec_driver_sql(ALTER_TRAFFIC_TIMESTAMP_SQL)
+            else:
+                logger.info("  [1/4] Column types already match the models")
+
+            # =================================================================
+            # STEP 2: Build tuned indexes (replacements under temporary names)
+            # =================================================================
+            builds = dict(to_create)
+            for name, definition in to_rebuild.items():
+                builds[name + REBUILD_SUFFIX] = definition
+
+            logger.info(f"  [2/4] Creating {len(builds)} index(es)...")
+
+            create_indexes_concurrently(engine, builds)
+
+            # =================================================================
+            # STEP 3: Swap rebuilt indexes in for the outdated ones
+            # =================================================================
+            logger.info(f"  [3/4] Swapping in {len(to_rebuild)} rebuilt index(es)...")
+
+            for name in to_rebuild:
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                    logger.info(f"  🗑️  Dropping outdated index {name} (concurrently)...")
+                    conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+                with engine.begin() as conn:
+                    set_local_timeouts(conn)
+                    logger.info(f"  🔁 Renaming {name}{REBUILD_SUFFIX} to {name}...")
+                    conn.exec_driver_sql(f"ALTER INDEX {name}{REBUILD_SUFFIX} RENAME TO {name}")
+
+            # =================================================================
+            # STEP 4: Drop obsolete indexes (their replacements now exist)
+            # =================================================================
+            logger.info(f"  [4/4] Dropping {len(to_drop)} index(es)...")
+
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for name in to_drop:
+                    logger.info(f"  🗑️  Dropping index {name} (concurrently)...")
+                    conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+            logger.info("🎉 Migration v0.0.5 completed successfully!")
+
+            return True
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+
+def rollback_migration():
+    """Rollback the migration (for development/testing only)."""
+
+    database_url = get_database_url()
+    logger.warning("⚠️ Rolling back migration v0.0.5...")
+
+    engine = get_engine(database_url)
+
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for name in INDEXES:
+                conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}{REBUILD_SUFFIX}")
+
+        create_indexes_concurrently(engine, ORIGINAL_INDEXES)
+        logger.info("✅ Rollback completed - original indexes restored")
+
+    except Exception as e:
+        logger.error(f"❌ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pulse Database Migration v0.0.5")
+    parser.add_argument("--rollback", action="store_true", help="Rollback the migration")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
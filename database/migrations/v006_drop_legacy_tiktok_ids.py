@@ -0,0 +1,174 @@
+"""
+Pulse Database Migration - v0.0.6 Drop Legacy TikTok ID Columns
+
+profiles.tiktok_user_id and posts.tiktok_post_id were kept next to the
+platform-neutral platform_user_id / platform_post_id columns while the
+scraper moved over. Nothing reads them any more, but every insert still
+writes them.
+
+Changes:
+- Backfills platform_user_id / platform_post_id from the legacy columns
+  where they are still NULL
+- Drops profiles.tiktok_user_id and posts.tiktok_post_id (and any index
+  built on them)
+
+Usage:
+    python -m database.migrations.v006_drop_legacy_tiktok_ids
+
+Environment Variables:
+    DATABASE_URL - PostgreSQL connection string
+"""
+
+import os
+import sys
+import logging
+
+from database.migrations.helpers import (
+    execute_batch,
+    get_engine,
+    run_with_lock_retry,
+    set_local_timeouts,
+    xact_advisory_lock,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Table -> (legacy column, replacement column)
+LEGACY_COLUMNS = {
+    "profiles": ("tiktok_user_id", "platform_user_id"),
+    "posts": ("tiktok_post_id", "platform_post_id"),
+}
+
+LEGACY_COLUMNS_QUERY = """
+    SELECT c.relname
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    WHERE (c.relname, a.attname) IN (('profiles', 'tiktok_user_id'), ('posts', 'tiktok_post_id'))
+    AND NOT a.attisdropped
+"""
+
+
+def get_database_url() -> str:
+    """Get database URL from environment."""
+    database_url = os.getenv("DATABASE_URL", "")
+
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable is not set. "
+            "Please set your PostgreSQL connection string."
+        )
+
+    # Railway/Heroku use 'postgres://' but SQLAlchemy requires 'postgresql://'
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    return database_url
+
+
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
+    return run_with_lock_retry(_run_migration, engine)
+
+
+def _run_migration(engine=None):
+    """Backfill and drop the legacy columns in one transaction."""
+
+    try:
+        import sqlalchemy  # noqa: F401
+    except ImportError:
+        logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
+        sys.exit(1)
+
+    database_url = get_database_url()
+    logger.info("🔄 Starting migration v0.0.6 - Drop Legacy TikTok ID Columns")
+    logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
+
+    engine = engine or get_engine(database_url)
+
+    try:
+        with engine.begin() as conn:
+            xact_advisory_lock(conn, "pulse_migration_v006")
+
+            # Check current state
+            logger.info("📋 Checking current database state...")
+
+            tables = [row[0] for row in conn.exec_driver_sql(LEGACY_COLUMNS_QUERY)]
+
+            if not tables:
+                logger.info("✅ Migration already applied (legacy ID columns are gone)")
+                return True
+
+            logger.info("🚀 Applying migration...")
+            set_local_timeouts(conn)
+
+            stmts = []
+            for table in tables:
+                legacy, replacement = LEGACY_COLUMNS[table]
+                logger.info(f"  🔁 Backfilling {table}.{replacement} and dropping {table}.{legacy}...")
+
+                stmts.append(f"""
+                    UPDATE {table}
+                    SET {replacement} = {legacy}
+                    WHERE {replacement} IS NULL AND {legacy} IS NOT NULL
+                """)
+                # Indexes and unique constraints on the column go with it
+                stmts.append(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {legacy}")
+
+            execute_batch(conn, stmts)
+
+        logger.info("🎉 Migration v0.0.6 completed successfully!")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+
+def rollback_migration():
+    """Rollback the migration (for development/testing only)."""
+
+    database_url = get_database_url()
+    logger.warning("⚠️ Rolling back migration v0.0.6...")
+
+    engine = get_engine(database_url)
+
+    try:
+        with engine.begin() as conn:
+            for table, (legacy, replacement) in LEGACY_COLUMNS.items():
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {legacy} VARCHAR(255)")
+                conn.exec_driver_sql(f"""
+                    UPDATE {table}
+                    SET {legacy} = {replacement}
+                    WHERE platform = 'tiktok'
+                """)
+        logger.info("✅ Rollback completed - legacy ID columns restored")
+
+    except Exception as e:
+        logger.error(f"❌ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pulse Database Migration v0.0.6")
+    parser.add_argument("--rollback", action="store_true", help="Rollback the migration")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
@@ -0,0 +1,185 @@
+"""
+Pulse Database Migration - v0.0.7 Server-Side Timestamps
+
+created_at / updated_at used to be filled in by Python (datetime.utcnow)
+and stored as naive TIMESTAMP. The models now declare them as
+TIMESTAMP WITH TIME ZONE with a now() server default.
+
+Changes:
+- Converts created_at / updated_at on profiles, posts and subreddit_traffic
+  to TIMESTAMPTZ (existing values are interpreted as UTC)
+- Sets DEFAULT now() on those columns
+
+With the session TimeZone set to UTC, PostgreSQL 12+ performs the
+TIMESTAMP -> TIMESTAMPTZ conversion without rewriting the table.
+
+Usage:
+    python -m database.migrations.v007_timestamptz_defaults
+
+Environment Variables:
+    DATABASE_URL - PostgreSQL connection string
+"""
+
+import os
+import sys
+import logging
+
+from database.migrations.helpers import (
+    execute_batch,
+    get_engine,
+    run_with_lock_retry,
+    set_local_timeouts,
+    xact_advisory_lock,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+TABLES = ["profiles", "posts", "subreddit_traffic"]
+COLUMNS = ["created_at", "updated_at"]
+
+# Columns still stored as naive TIMESTAMP
+PENDING_COLUMNS_QUERY = """
+    SELECT c.relname, a.attname
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    WHERE c.relname = ANY(%(tables)s)
+    AND a.attname = ANY(%(columns)s)
+    AND a.atttypid = 'timestamp'::regtype
+    AND NOT a.attisdropped
+"""
+
+# Makes the type change metadata-only and pins the meaning of existing values
+SET_UTC_SQL = "SET LOCAL TimeZone = 'UTC'"
+
+
+def get_database_url() -> str:
+    """Get database URL from environment."""
+    database_url = os.getenv("DATABASE_URL", "")
+
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable is not set. "
+            "Please set your PostgreSQL connection string."
+        )
+
+    # Railway/Heroku use 'postgres://' but SQLAlchemy requires 'postgresql://'
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    return database_url
+
+
+def alter_columns_sql(table: str, columns: list, type_: str, default: str) -> str:
+    """Build one ALTER TABLE that retypes and re-defaults the given columns."""
+    clauses = []
+    for column in columns:
+        clauses.append(f"ALTER COLUMN {column} TYPE {type_}")
+        clauses.append(f"ALTER COLUMN {column} SET DEFAULT {default}")
+    return f"ALTER TABLE {table} " + ", ".join(clauses)
+
+
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
+    return run_with_lock_retry(_run_migration, engine)
+
+
+def _run_migration(engine=None):
+    """Convert the pending columns in one transaction."""
+
+    try:
+        import sqlalchemy  # noqa: F401
+    except ImportError:
+        logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
+        sys.exit(1)
+
+    database_url = get_database_url()
+    logger.info("🔄 Starting migration v0.0.7 - Server-Side Timestamps")
+    logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
+
+    engine = engine or get_engine(database_url)
+
+    try:
+        with engine.begin() as conn:
+            xact_advisory_lock(conn, "pulse_migration_v007")
+
+            # Check current state
+            logger.info("📋 Checking current database state...")
+
+            result = conn.exec_driver_sql(
+                PENDING_COLUMNS_QUERY, {"tables": TABLES, "columns": COLUMNS}
+            )
+            pending = {}
+            for table, column in result.fetchall():
+                pending.setdefault(table, []).append(column)
+
+            if not pending:
+                logger.info("✅ Migration already applied (timestamps are TIMESTAMPTZ)")
+                return True
+
+            logger.info("🚀 Applying migration...")
+            set_local_timeouts(conn)
+            conn.exec_driver_sql(SET_UTC_SQL)
+
+            stmts = []
+            for table, columns in pending.items():
+                logger.info(f"  🕒 {table}: {', '.join(columns)} -> TIMESTAMPTZ DEFAULT now()")
+                stmts.append(alter_columns_sql(table, columns, "TIMESTAMPTZ", "now()"))
+
+            execute_batch(conn, stmts)
+
+        logger.info("🎉 Migration v0.0.7 completed successfully!")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+
+def rollback_migration():
+    """Rollback the migration (for development/testing only)."""
+
+    database_url = get_database_url()
+    logger.warning("⚠️ Rolling back migration v0.0.7...")
+
+    engine = get_engine(database_url)
+
+    try:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(SET_UTC_SQL)
+            for table in TABLES:
+                if conn.exec_driver_sql(f"SELECT to_regclass('{table}')").scalar() is None:
+                    continue
+                conn.exec_driver_sql(
+                    alter_columns_sql(table, COLUMNS, "TIMESTAMP", "CURRENT_TIMESTAMP")
+                )
+        logger.info("✅ Rollback completed - timestamps restored to TIMESTAMP")
+
+    except Exception as e:
+        logger.error(f"❌ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pulse Database Migration v0.0.7")
+    parser.add_argument("--rollback", action="store_true", help="Rollback the migration")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
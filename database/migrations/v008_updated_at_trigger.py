@@ -0,0 +1,178 @@
+"""
+Pulse Database Migration - v0.0.8 updated_at Trigger
+
+updated_at used to be refreshed by SQLAlchemy's onupdate hook, so only ORM
+flushes touched it. The models now rely on a BEFORE UPDATE trigger instead,
+which also covers Core upserts and raw SQL.
+
+Changes:
+- Creates (or replaces) the set_updated_at() trigger function
+- Adds a trg_<table>_updated_at trigger to profiles, posts and
+  subreddit_traffic where it is missing
+
+Usage:
+    python -m database.migrations.v008_updated_at_trigger
+
+Environment Variables:
+    DATABASE_URL - PostgreSQL connection string
+"""
+
+import os
+import sys
+import logging
+
+from database.migrations.helpers import (
+    execute_batch,
+    get_engine,
+    run_with_lock_retry,
+    set_local_timeouts,
+    xact_advisory_lock,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+TABLES = ["profiles", "posts", "subreddit_traffic"]
+
+# Tables that exist but don't have their trigger yet
+MISSING_TRIGGERS_QUERY = """
+    SELECT t.name
+    FROM unnest(%(tables)s::text[]) AS t(name)
+    WHERE to_regclass(t.name) IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgrelid = to_regclass(t.name)
+        AND tgname = 'trg_' || t.name || '_updated_at'
+    )
+"""
+
+CREATE_FUNCTION_SQL = """
+    CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at = now();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+CREATE_TRIGGER_SQL = """
+    CREATE TRIGGER trg_{table}_updated_at
+    BEFORE UPDATE ON {table}
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+"""
+
+
+def get_database_url() -> str:
+    """Get database URL from environment."""
+    database_url = os.getenv("DATABASE_URL", "")
+
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable is not set. "
+            "Please set your PostgreSQL connection string."
+        )
+
+    # Railway/Heroku use 'postgres://' but SQLAlchemy requires 'postgresql://'
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    return database_url
+
+
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
+    return run_with_lock_retry(_run_migration, engine)
+
+
+def _run_migration(engine=None):
+    """Install the function and any missing triggers in one transaction."""
+
+    try:
+        import sqlalchemy  # noqa: F401
+    except ImportError:
+        logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
+        sys.exit(1)
+
+    database_url = get_database_url()
+    logger.info("🔄 Starting migration v0.0.8 - updated_at Trigger")
+    logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
+
+    engine = engine or get_engine(database_url)
+
+    try:
+        with engine.begin() as conn:
+            xact_advisory_lock(conn, "pulse_migration_v008")
+
+            # Check current state
+            logger.info("📋 Checking current database state...")
+
+            result = conn.exec_driver_sql(MISSING_TRIGGERS_QUERY, {"tables": TABLES})
+            tables = [row[0] for row in result.fetchall()]
+
+            if not tables:
+                logger.info("✅ Migration already applied (updated_at triggers exist)")
+                return True
+
+            logger.info("🚀 Applying migration...")
+            set_local_timeouts(conn)
+
+            stmts = [CREATE_FUNCTION_SQL]
+            for table in tables:
+                logger.info(f"  ⚡ Adding trg_{table}_updated_at...")
+                stmts.append(CREATE_TRIGGER_SQL.format(table=table))
+
+            execute_batch(conn, stmts)
+
+        logger.info("🎉 Migration v0.0.8 completed successfully!")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+
+def rollback_migration():
+    """Rollback the migration (for development/testing only)."""
+
+    database_url = get_database_url()
+    logger.warning("⚠️ Rolling back migration v0.0.8...")
+
+    engine = get_engine(database_url)
+
+    try:
+        with engine.begin() as conn:
+            for table in TABLES:
+                if conn.exec_driver_sql(f"SELECT to_regclass('{table}')").scalar() is None:
+                    continue
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+            conn.exec_driver_sql("DROP FUNCTION IF EXISTS set_updated_at()")
+        logger.info("✅ Rollback completed - updated_at triggers dropped")
+
+    except Exception as e:
+        logger.error(f"❌ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pulse Database Migration v0.0.8")
+    parser.add_argument("--rollback", action="store_true", help="Rollback the migration")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
@@ -0,0 +1,226 @@
+"""
+Pulse Database Migration - v0.0.9 Unique Constraints
+
+v0.0.2 added the platform-aware unique constraints, but databases created
+straight from the models (create_all) never got them. The scraper's batched
+post upsert (INSERT ... ON CONFLICT) needs them as its conflict target.
+
+Changes:
+- Adds uq_profile_username_platform UNIQUE (username, platform) on profiles
+- Adds uq_post_platform_id UNIQUE (platform_post_id, platform) on posts
+- Drops the single-column username / platform_post_id indexes, whose
+  lookups the constraints' leading column now serves
+
+Each constraint is built as a unique index CONCURRENTLY and then attached
+with ADD CONSTRAINT ... USING INDEX, so the table is never locked for the
+duration of the index build. If duplicate rows exist the migration stops
+and reports them instead of deleting anything.
+
+Usage:
+    python -m database.migrations.v009_unique_constraints
+
+Environment Variables:
+    DATABASE_URL - PostgreSQL connection string
+"""
+
+import os
+import sys
+import logging
+
+from database.migrations.helpers import (
+    get_engine,
+    session_advisory_lock,
+    set_local_timeouts,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# (table, constraint name, columns)
+UNIQUE_CONSTRAINTS = [
+    ("profiles", "uq_profile_username_platform", "username, platform"),
+    ("posts", "uq_post_platform_id", "platform_post_id, platform"),
+]
+
+# Superseded by the constraints above (schema.sql and create_all names)
+REDUNDANT_INDEXES = [
+    "idx_profiles_username",
+    "ix_profiles_username",
+    "idx_posts_platform_post_id",
+    "ix_posts_platform_post_id",
+]
+
+EXISTING_CONSTRAINTS_QUERY = """
+    SELECT conname
+    FROM pg_constraint
+    WHERE conname = ANY(%(names)s)
+"""
+
+EXISTING_INDEXES_QUERY = """
+    SELECT indexname
+    FROM pg_indexes
+    WHERE indexname = ANY(%(names)s)
+"""
+
+# Unique index left INVALID by an interrupted concurrent build
+INVALID_INDEX_QUERY = """
+    SELECT 1
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid
+    AND c.relname = %(name)s
+"""
+
+DUPLICATES_QUERY = """
+    SELECT count(*)
+    FROM (
+        SELECT 1 FROM {table}
+        GROUP BY {columns}
+        HAVING count(*) > 1
+    ) AS dupes
+"""
+
+
+def get_database_url() -> str:
+    """Get database URL from environment."""
+    database_url = os.getenv("DATABASE_URL", "")
+
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable is not set. "
+            "Please set your PostgreSQL connection string."
+        )
+
+    # Railway/Heroku use 'postgres://' but SQLAlchemy requires 'postgresql://'
+    if database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    return database_url
+
+
+def run_migration(engine=None):
+    """
+    Execute the database migration.
+
+    Args:
+        engine: Optional engine to reuse (e.g. from run_all_migrations);
+                defaults to the shared cached engine for DATABASE_URL.
+    """
+
+    try:
+        import sqlalchemy  # noqa: F401
+    except ImportError:
+        logger.error("SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
+        sys.exit(1)
+
+    database_url = get_database_url()
+    logger.info("🔄 Starting migration v0.0.9 - Unique Constraints")
+    logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
+
+    engine = engine or get_engine(database_url)
+
+    try:
+        # Web and worker run this at the same time. Unserialized, one run's
+        # invalid-index cleanup would drop the other's in-progress build.
+        # The state is checked once the lock is held.
+        with session_advisory_lock(engine, "pulse_migration_v009"):
+            # Check current state
+            logger.info("📋 Checking current database state...")
+
+            names = [name for _, name, _ in UNIQUE_CONSTRAINTS]
+            with engine.connect() as conn:
+                result = conn.exec_driver_sql(EXISTING_CONSTRAINTS_QUERY, {"names": names})
+                existing = {row[0] for row in result.fetchall()}
+
+                missing = [c for c in UNIQUE_CONSTRAINTS if c[1] not in existing]
+
+                result = conn.exec_driver_sql(EXISTING_INDEXES_QUERY, {"names": REDUNDANT_INDEXES})
+                redundant = [row[0] for row in result.fetchall()]
+
+                for table, name, columns in missing:
+                    dupes = conn.exec_driver_sql(
+                        DUPLICATES_QUERY.format(table=table, columns=columns)
+                    ).scalar()
+                    if dupes:
+                        raise ValueError(
+                            f"{table} has {dupes} duplicate ({columns}) group(s); "
+                            f"remove them before adding {name}"
+                        )
+
+            if not missing and not redundant:
+                logger.info("✅ Migration already applied (unique constraints exist)")
+                return True
+
+            logger.info("🚀 Applying migration...")
+
+            # CONCURRENTLY cannot run inside a transaction block
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for table, name, columns in missing:
+                    if conn.exec_driver_sql(INVALID_INDEX_QUERY, {"name": name}).first():
+                        logger.warning(f"  ⚠️  Dropping invalid index left by an interrupted build: {name}")
+                        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+                    logger.info(f"  📇 Creating unique index {name} (concurrently)...")
+                    conn.exec_driver_sql(
+                        f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"
+                    )
+
+            # Attaching a ready index is a catalog-only change
+            with engine.begin() as conn:
+                set_local_timeouts(conn)
+                for table, name, columns in missing:
+                    logger.info(f"  🔗 Adding constraint {name} on {table} ({columns})...")
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"
+                    )
+
+            # Only dropped once the constraints that replace them are in place
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                for name in redundant:
+                    logger.info(f"  🗑️  Dropping index {name} (concurrently)...")
+                    conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+            logger.info("🎉 Migration v0.0.9 completed successfully!")
+
+            return True
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        raise
+
+
+def rollback_migration():
+    """Rollback the migration (for development/testing only)."""
+
+    database_url = get_database_url()
+    logger.warning("⚠️ Rolling back migration v0.0.9...")
+
+    engine = get_engine(database_url)
+
+    try:
+        with engine.begin() as conn:
+            for table, name, _columns in UNIQUE_CONSTRAINTS:
+                conn.exec_driver_sql(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        logger.info("✅ Rollback completed - unique constraints dropped")
+
+    except Exception as e:
+        logger.error(f"❌ Rollback failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pulse Database Migration v0.0.9")
+    parser.add_argument("--rollback", action="store_true", help="Rollback the migration")
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback_migration()
+    else:
+        run_migration()
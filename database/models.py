@@ -6,11 +6,11 @@ Version 0.0.3 - Railway Deployment with Automatic Migrations
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, BigInteger, String, Text, DateTime, 
-    ForeignKey, Float, Boolean, Index, UniqueConstraint
+    Column, Integer, BigInteger, String, Text, Date, DateTime, 
+    DDL, FetchedValue, ForeignKey, Float, Boolean, Identity, Index, UniqueConstraint,
+    event, func, text
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
 
@@ -45,16 +45,13 @@ class Profile(Base):
     """
     __tablename__ = 'profiles'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
     
     # Platform identification
     platform = Column(String(32), nullable=False, default=Platform.TIKTOK, index=True)
     platform_user_id = Column(String(255), nullable=True)  # Platform's internal ID (secUid for TikTok)
-    username = Column(String(64), nullable=False, index=True)  # @handle
+    username = Column(String(64), nullable=False)  # @handle (looked up via uq_profile_username_platform)
 
-    # Legacy column - kept for backwards compatibility during migration
-    tiktok_user_id = Column(String(255), nullable=True)  # TikTok secUid (increased to 255 for long identifiers)
-    
     # User categorization
     user_role = Column(String(32), nullable=True, default=UserRole.CREATOR)
     
@@ -79,13 +76,27 @@ class Profile(Base):
     
     # Tracking
     is_active = Column(Boolean, default=True)  # Soft delete / pause tracking
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())  # set_updated_at trigger
     last_scraped_at = Column(DateTime, nullable=True)  # Last successful API fetch
     
-    # Relationships
-    posts = relationship("Post", back_populates="profile", cascade="all, delete-orphan")
-    history = relationship("ProfileHistory", back_populates="profile", cascade="all, delete-orphan")
+    # Relationships. Never lazy-loaded: a profile can have thousands of posts
+    # and history rows, so callers must eager-load them explicitly, e.g.
+    # select(Profile).options(selectinload(Profile.posts)). The FKs are
+    # ON DELETE CASCADE, so deleting a profile doesn't need them loaded.
+    posts = relationship(
+        "Post", back_populates="profile", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
+    history = relationship(
+        "ProfileHistory", back_populates="profile", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
+
+    __table_args__ = (
+        # One row per handle per platform; also serves username lookups
+        UniqueConstraint('username', 'platform', name='uq_profile_username_platform'),
+    )
 
     def __repr__(self):
         return f"<Profile [{self.platform}] @{self.username} | {self.follower_count:,} followers>"
@@ -103,8 +114,8 @@ class ProfileHistory(Base):
     """
     __tablename__ = 'profile_history'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    profile_id = Column(Integer, ForeignKey('profiles.id', ondelete='CASCADE'), nullable=False)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
+    profile_id = Column(BigInteger, ForeignKey('profiles.id', ondelete='CASCADE'), nullable=False)
     
     # Snapshot of metrics at this point in time
     follower_count = Column(BigInteger, default=0)
@@ -120,14 +131,26 @@ class ProfileHistory(Base):
     follower_change = Column(Integer, default=0)  # +/- followers since last snapshot
     likes_change = Column(Integer, default=0)
     
-    recorded_at = Column(DateTime, default=datetime.utcnow, index=True)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationship
     profile = relationship("Profile", back_populates="history")
 
-    # Composite index for efficient time-series queries
+    # Covering index for "latest snapshots for a profile" chart queries
     __table_args__ = (
-        Index('idx_profile_history_lookup', 'profile_id', 'recorded_at'),
+        Index(
+            'idx_profile_history_lookup', profile_id, recorded_at.desc(),
+            postgresql_include=[
+                'follower_count', 'following_count', 'total_likes', 'video_count',
+                'follower_change', 'subreddit_subscribers', 'active_users',
+            ],
+        ),
+        # Append-only by recorded_at: BRIN serves time-range scans and purges
+        Index(
+            'idx_profile_history_recorded_brin', recorded_at,
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 64},
+        ),
     )
 
     def __repr__(self):
@@ -145,16 +168,13 @@ class Post(Base):
     """
     __tablename__ = 'posts'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    profile_id = Column(Integer, ForeignKey('profiles.id', ondelete='CASCADE'), nullable=False)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
+    profile_id = Column(BigInteger, ForeignKey('profiles.id', ondelete='CASCADE'), nullable=False)
     
     # Platform identification
     platform = Column(String(32), nullable=False, default=Platform.TIKTOK, index=True)
-    platform_post_id = Column(String(255), nullable=True, index=True)  # Platform's post ID (increased to 255 for long IDs)
+    platform_post_id = Column(String(255), nullable=True)  # Platform's post ID (increased to 255 for long IDs)
 
-    # Legacy column - kept for backwards compatibility during migration
-    tiktok_post_id = Column(String(255), nullable=True)  # Increased to 255 for long identifiers
-    
     # Content info (common across platforms)
     description = Column(Text, nullable=True)  # Caption/text/title
     video_url = Column(Text, nullable=True)  # Media URL
@@ -185,14 +205,30 @@ class Post(Base):
     
     # Timestamps
     posted_at = Column(DateTime, nullable=True)  # When posted on platform
-    created_at = Column(DateTime, default=datetime.utcnow)  # When we first scraped it
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())  # When we first scraped it
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())  # set_updated_at trigger
     
     # Relationship
     profile = relationship("Profile", back_populates="posts")
 
+    __table_args__ = (
+        # Conflict target for the scraper's batched upsert; also serves
+        # platform_post_id lookups
+        UniqueConstraint('platform_post_id', 'platform', name='uq_post_platform_id'),
+        # Covering index for "latest posts per profile" timelines
+        Index(
+            'idx_posts_profile_posted', profile_id, posted_at.desc(),
+            postgresql_include=['view_count', 'like_count', 'comment_count', 'share_count', 'is_viral'],
+        ),
+        # Partial index: only posts still waiting on a viral alert are indexed
+        Index(
+            'idx_posts_viral_pending', profile_id,
+            postgresql_where=text('is_viral AND NOT viral_alert_sent'),
+        ),
+    )
+
     def __repr__(self):
-        post_id = self.platform_post_id or self.tiktok_post_id or "unknown"
+        post_id = self.platform_post_id or "unknown"
         return f"<Post [{self.platform}] {post_id} | {self.view_count:,} views>"
 
 
@@ -207,8 +243,8 @@ class PostHistory(Base):
     """
     __tablename__ = 'post_history'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    post_id = Column(Integer, ForeignKey('posts.id', ondelete='CASCADE'), nullable=False)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
+    post_id = Column(BigInteger, ForeignKey('posts.id', ondelete='CASCADE'), nullable=False)
     
     # Common metrics snapshot
     view_count = Column(BigInteger, default=0)
@@ -224,10 +260,20 @@ class PostHistory(Base):
     upvote_ratio = Column(Float, nullable=True)
     reddit_score = Column(Integer, nullable=True)
     
-    recorded_at = Column(DateTime, default=datetime.utcnow, index=True)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
 
+    # Covering index for per-post engagement time series
     __table_args__ = (
-        Index('idx_post_history_lookup', 'post_id', 'recorded_at'),
+        Index(
+            'idx_post_history_lookup', post_id, recorded_at.desc(),
+            postgresql_include=['view_count', 'like_count', 'comment_count', 'share_count'],
+        ),
+        # Append-only by recorded_at: BRIN serves time-range scans and purges
+        Index(
+            'idx_post_history_recorded_brin', recorded_at,
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 64},
+        ),
     )
 
     def __repr__(self):
@@ -244,9 +290,9 @@ class AlertLog(Base):
     """
     __tablename__ = 'alert_logs'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    post_id = Column(Integer, ForeignKey('posts.id', ondelete='SET NULL'), nullable=True)
-    profile_id = Column(Integer, ForeignKey('profiles.id', ondelete='SET NULL'), nullable=True)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
+    post_id = Column(BigInteger, ForeignKey('posts.id', ondelete='SET NULL'), nullable=True)
+    profile_id = Column(BigInteger, ForeignKey('profiles.id', ondelete='SET NULL'), nullable=True)
 
     # Platform for context
     platform = Column(String(32), nullable=True)
@@ -273,13 +319,13 @@ class SubredditTraffic(Base):
     """
     __tablename__ = 'subreddit_traffic'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(BigInteger, Identity(always=False), primary_key=True)
 
-    # Subreddit identification
-    subreddit_name = Column(String(128), nullable=False, index=True)
+    # Subreddit identification (lookups use idx_subreddit_traffic_lookup)
+    subreddit_name = Column(String(128), nullable=False)
 
-    # Traffic date (unique per subreddit per day)
-    timestamp = Column(DateTime, nullable=False, index=True)
+    # Traffic date (unique per subreddit per day) - DATE, matching the v0.0.4 DDL
+    timestamp = Column(Date, nullable=False)
 
     # Traffic metrics
     unique_visitors = Column(Integer, default=0)  # Unique visitors for the day
@@ -287,14 +333,47 @@ class SubredditTraffic(Base):
     subscriptions = Column(Integer, default=0)  # Net new subscribers for the day
 
     # Tracking
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())  # set_updated_at trigger
 
     # Unique constraint on subreddit + date to support upsert pattern
     __table_args__ = (
         UniqueConstraint('subreddit_name', 'timestamp', name='uq_subreddit_traffic_date'),
         Index('idx_subreddit_traffic_lookup', 'subreddit_name', 'timestamp'),
+        # Rows are appended in date order, so a BRIN range index is tiny and enough
+        Index(
+            'idx_subreddit_traffic_timestamp', 'timestamp',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
     )
 
     def __repr__(self):
         return f"<SubredditTraffic r/{self.subreddit_name} | {self.timestamp} | {self.pageviews:,} views>"
+
+
+# =============================================================================
+# UPDATED_AT TRIGGER
+# =============================================================================
+# updated_at is maintained by a BEFORE UPDATE trigger, so every writer (ORM,
+# Core upserts, raw SQL) gets the same timestamp and the ORM never has to
+# add the column to its UPDATEs. create_all() installs it on new tables.
+
+SET_UPDATED_AT_FUNCTION = DDL("""
+    CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+    BEGIN
+        NEW.updated_at = now();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+""")
+
+SET_UPDATED_AT_TRIGGER = DDL("""
+    CREATE TRIGGER trg_%(table)s_updated_at
+    BEFORE UPDATE ON %(table)s
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+""")
+
+for _model in (Profile, Post, SubredditTraffic):
+    event.listen(_model.__table__, "after_create", SET_UPDATED_AT_FUNCTION.execute_if(dialect="postgresql"))
+    event.listen(_model.__table__, "after_create", SET_UPDATED_AT_TRIGGER.execute_if(dialect="postgresql"))
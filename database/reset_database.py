@@ -16,18 +16,32 @@ Usage:
 
     # With confirmation prompt
     python -m database.reset_database --confirm
+
+    # Online: batched deletes that don't lock out the running app
+    python -m database.reset_database --online
+
+    # Online, without per-row FK trigger checks during the deletes
+    python -m database.reset_database --online --drop-fks
 """
 
 import os
 import sys
+import time
 import logging
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path for imports when run as a plain script
+# (python database/reset_database.py); package imports already have it
+if __name__ == "__main__":
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from sqlalchemy import bindparam, delete, literal_column, select, text
+from sqlalchemy.orm import Session
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from database.engine import get_engine
+from database.migrations.helpers import create_indexes_concurrently
+from database.models import AlertLog, Post, PostHistory, Profile, ProfileHistory
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +50,75 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Child tables first; CASCADE covers anything else referencing them
+RESET_MODELS = [AlertLog, PostHistory, Post, ProfileHistory, Profile]
+RESET_TABLES = [model.__tablename__ for model in RESET_MODELS]
+
+# Online reset order: the tables within a stage don't reference each other,
+# so they are emptied concurrently on separate connections
+RESET_STAGES = [
+    ["alert_logs", "post_history", "profile_history"],
+    ["posts"],
+    ["profiles"],
+]
+
+TRUNCATE_SQL = text(
+    f"TRUNCATE TABLE {', '.join(RESET_TABLES)} RESTART IDENTITY CASCADE"
+)
+
+# reltuples is -1 for tables that have never been vacuumed/analyzed
+ROW_ESTIMATES_QUERY = text("""
+    SELECT relname, GREATEST(reltuples, 0)::bigint
+    FROM pg_class
+    WHERE relname = ANY(:tables)
+    AND relkind = 'r'
+""").bindparams(tables=RESET_TABLES)
+
+
+def batch_delete_statement(table):
+    """
+    Build a Core DELETE that removes one bounded batch of rows:
+
+        WITH batch AS (SELECT ctid FROM t LIMIT :batch_size FOR UPDATE SKIP LOCKED)
+        DELETE FROM t USING batch WHERE t.ctid = batch.ctid
+
+    Rows locked by live writers are skipped and picked up by a later batch.
+    """
+    batch = (
+        select(literal_column("ctid"))
+        .select_from(table)
+        .limit(bindparam("batch_size"))
+        .with_for_update(skip_locked=True)
+        .cte("batch")
+    )
+    return delete(table).where(literal_column(f"{table.name}.ctid") == batch.c.ctid)
+
+
+# Built once so every batch hits SQLAlchemy's compiled-statement cache
+BATCH_DELETES = {model.__tablename__: batch_delete_statement(model.__table__) for model in RESET_MODELS}
+
+FOREIGN_KEYS_QUERY = text("""
+    SELECT conrelid::regclass::text, quote_ident(conname), pg_get_constraintdef(oid)
+    FROM pg_constraint
+    WHERE contype = 'f'
+    AND conrelid::regclass::text = ANY(:tables)
+""").bindparams(tables=RESET_TABLES)
+
+# FK columns with no index leading on them: deleting a parent row then
+# seq-scans the child table to find referencing rows
+UNINDEXED_FOREIGN_KEYS_QUERY = text("""
+    SELECT c.conrelid::regclass::text, a.attname
+    FROM pg_constraint c
+    JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+    WHERE c.contype = 'f'
+    AND c.conrelid::regclass::text = ANY(:tables)
+    AND NOT EXISTS (
+        SELECT 1 FROM pg_index i
+        WHERE i.indrelid = c.conrelid
+        AND i.indkey[0] = c.conkey[1]
+    )
+""").bindparams(tables=RESET_TABLES)
+
 
 def get_database_url() -> str:
     """Get database URL from environment."""
@@ -54,12 +137,124 @@ def get_database_url() -> str:
     return database_url
 
 
-def reset_all_data(confirm: bool = False) -> bool:
+def delete_in_batches(session, table: str, batch_size: int, pause_ms: int) -> int:
+    """
+    Empty a table with short DELETE transactions instead of one long one.
+
+    Each batch commits on its own and is followed by a pause, so concurrent
+    INSERT/UPDATE traffic can take its locks in between.
+
+    Returns:
+        Number of rows deleted
+    """
+    statement = BATCH_DELETES[table]
+    deleted = 0
+
+    while True:
+        result = session.execute(statement, {"batch_size": batch_size})
+        session.commit()
+
+        if result.rowcount == 0:
+            return deleted
+
+        deleted += result.rowcount
+        time.sleep(pause_ms / 1000)
+
+
+def delete_stage_in_batches(engine, tables: list, batch_size: int, pause_ms: int) -> dict:
+    """
+    Run delete_in_batches() for independent tables in parallel.
+
+    Each table gets its own session (and pooled connection), so wall time
+    is that of the largest table instead of the sum of all of them.
+
+    Returns:
+        {table: rows deleted}
+    """
+    def worker(table):
+        with Session(engine) as session:
+            return delete_in_batches(session, table, batch_size, pause_ms)
+
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        return dict(zip(tables, executor.map(worker, tables)))
+
+
+def ensure_foreign_key_indexes(session, engine) -> list:
+    """
+    Index any FK column between the reset tables that has no index yet.
+
+    The indexes are built CONCURRENTLY on a separate connection, so the
+    session's transaction is closed first. One-time cost; later resets (and
+    the app's own parent deletes) find them in place.
+
+    Returns:
+        Names of the indexes created
+    """
+    missing = session.execute(UNINDEXED_FOREIGN_KEYS_QUERY).fetchall()
+    session.commit()
+
+    indexes = {f"idx_{table}_{column}": f"ON {table} ({column})" for table, column in missing}
+    create_indexes_concurrently(engine, indexes)
+
+    return list(indexes)
+
+
+def drop_foreign_keys(session) -> list:
+    """
+    Drop the FKs between the reset tables, returning their definitions.
+
+    Without them, deleting a parent row no longer fires a referential
+    trigger per row. The DDL is only a catalog change, committed right away.
+    """
+    foreign_keys = session.execute(FOREIGN_KEYS_QUERY).fetchall()
+
+    for table, name, _definition in foreign_keys:
+        session.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+    session.commit()
+
+    return foreign_keys
+
+
+def restore_foreign_keys(session, foreign_keys: list) -> None:
+    """
+    Re-create FKs dropped by drop_foreign_keys().
+
+    They are added NOT VALID (instant, enforced for new writes) and then
+    validated, which scans the children without blocking writers. If rows
+    orphaned by concurrent writes make validation fail, the constraint is
+    left NOT VALID and a warning is logged.
+    """
+    for table, name, definition in foreign_keys:
+        session.execute(text(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition} NOT VALID"))
+    session.commit()
+
+    for table, name, _definition in foreign_keys:
+        try:
+            session.execute(text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}"))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.warning("     ⚠️  %s.%s left NOT VALID: %s", table, name, e)
+
+
+def reset_all_data(
+    confirm: bool = False,
+    online: bool = False,
+    batch_size: int = 5000,
+    pause_ms: int = 100,
+    drop_fks: bool = False
+) -> bool:
     """
     Delete all data from all tables while preserving schema.
 
     Args:
         confirm: If True, skip confirmation prompt (use with caution!)
+        online: If True, delete in small batches instead of one TRUNCATE so
+                the app can keep reading and writing (ID sequences are kept)
+        batch_size: Rows per DELETE batch in online mode
+        pause_ms: Pause between batches in online mode
+        drop_fks: In online mode, drop the FKs between the tables for the
+                  duration of the deletes and restore them afterwards
 
     Returns:
         True if successful, False otherwise
@@ -87,88 +282,95 @@ def reset_all_data(confirm: bool = False) -> bool:
     try:
         database_url = get_database_url()
         logger.info("🔄 Starting database reset...")
-        logger.info(f"📊 Database: {database_url.split('@')[-1] if '@' in database_url else 'local'}")
+        logger.info("📊 Database: %s", database_url.split('@')[-1] if '@' in database_url else 'local')
         logger.info("")
 
-        engine = create_engine(database_url)
-        Session = sessionmaker(bind=engine)
-        session = Session()
-
-        try:
-            # Disable foreign key checks temporarily (for PostgreSQL)
-            # Note: PostgreSQL doesn't have a global FK disable, so we use CASCADE
-
-            # =====================================================================
-            # Delete in correct order to respect foreign key constraints
-            # =====================================================================
-
-            logger.info("  [1/5] Deleting alert logs...")
-            result = session.execute(text("DELETE FROM alert_logs"))
-            alert_count = result.rowcount
-            session.commit()
-            logger.info(f"     ✅ Deleted {alert_count} alert logs")
-
-            logger.info("  [2/5] Deleting post history...")
-            result = session.execute(text("DELETE FROM post_history"))
-            post_history_count = result.rowcount
-            session.commit()
-            logger.info(f"     ✅ Deleted {post_history_count} post history records")
-
-            logger.info("  [3/5] Deleting posts...")
-            result = session.execute(text("DELETE FROM posts"))
-            posts_count = result.rowcount
-            session.commit()
-            logger.info(f"     ✅ Deleted {posts_count} posts")
-
-            logger.info("  [4/5] Deleting profile history...")
-            result = session.execute(text("DELETE FROM profile_history"))
-            profile_history_count = result.rowcount
-            session.commit()
-            logger.info(f"     ✅ Deleted {profile_history_count} profile history records")
-
-            logger.info("  [5/5] Deleting profiles...")
-            result = session.execute(text("DELETE FROM profiles"))
-            profiles_count = result.rowcount
-            session.commit()
-            logger.info(f"     ✅ Deleted {profiles_count} profiles")
-
-            # Reset sequences (auto-increment counters)
-            logger.info("")
-            logger.info("  [6/6] Resetting ID sequences...")
-            session.execute(text("ALTER SEQUENCE profiles_id_seq RESTART WITH 1"))
-            session.execute(text("ALTER SEQUENCE profile_history_id_seq RESTART WITH 1"))
-            session.execute(text("ALTER SEQUENCE posts_id_seq RESTART WITH 1"))
-            session.execute(text("ALTER SEQUENCE post_history_id_seq RESTART WITH 1"))
-            session.execute(text("ALTER SEQUENCE alert_logs_id_seq RESTART WITH 1"))
-            session.commit()
-            logger.info("     ✅ All ID sequences reset to 1")
-
-            logger.info("")
-            logger.info("=" * 70)
-            logger.info("🎉 DATABASE RESET COMPLETE")
-            logger.info("=" * 70)
-            logger.info("")
-            logger.info(f"Total records deleted:")
-            logger.info(f"  - Profiles: {profiles_count}")
-            logger.info(f"  - Posts: {posts_count}")
-            logger.info(f"  - Profile History: {profile_history_count}")
-            logger.info(f"  - Post History: {post_history_count}")
-            logger.info(f"  - Alert Logs: {alert_count}")
-            logger.info("")
-            logger.info("✅ Database is now empty and ready for fresh data")
-
-            return True
-
-        except Exception as e:
-            session.rollback()
-            logger.error(f"❌ Reset failed: {e}")
-            raise
-
-        finally:
-            session.close()
+        engine = get_engine(database_url)
+
+        # The session is closed (and its connection returned) however we leave
+        with Session(engine) as session:
+            try:
+                if online:
+                    # =================================================================
+                    # Batched deletes, children first
+                    # =================================================================
+                    # TRUNCATE takes an ACCESS EXCLUSIVE lock on every table; this
+                    # path never holds row locks for longer than one batch.
+                    # Each table is emptied explicitly rather than via ON DELETE
+                    # CASCADE from profiles: a cascading batch would drag in every
+                    # post and history row of its profiles, and alert_logs is
+                    # ON DELETE SET NULL, so it would be rewritten, not emptied.
+                    counts = {}
+                    approx = ""
+                    foreign_keys = []
+
+                    created = ensure_foreign_key_indexes(session, engine)
+                    if created:
+                        logger.info("  📇 Indexed %d foreign key column(s): %s", len(created), ", ".join(created))
+
+                    if drop_fks:
+                        foreign_keys = drop_foreign_keys(session)
+                        logger.info("  🔓 Dropped %d foreign keys for the reset", len(foreign_keys))
+
+                    try:
+                        for step, tables in enumerate(RESET_STAGES, 1):
+                            logger.info("  [%d/%d] Deleting %s in batches of %d...", step, len(RESET_STAGES), ", ".join(tables), batch_size)
+                            stage_counts = delete_stage_in_batches(engine, tables, batch_size, pause_ms)
+                            for table, count in stage_counts.items():
+                                logger.info("     ✅ Deleted %d rows from %s", count, table)
+                            counts.update(stage_counts)
+                    finally:
+                        if foreign_keys:
+                            session.rollback()
+                            restore_foreign_keys(session, foreign_keys)
+                            logger.info("  🔒 Restored %d foreign keys", len(foreign_keys))
+
+                else:
+                    # Approximate row counts from planner statistics (no table scans)
+                    counts = dict(session.execute(ROW_ESTIMATES_QUERY).fetchall())
+                    approx = "~"
+
+                    # =================================================================
+                    # Truncate every table in one statement
+                    # =================================================================
+                    # TRUNCATE unlinks the relation files instead of deleting row by
+                    # row, so there is no per-row WAL, no FK trigger firing and nothing
+                    # left for autovacuum. RESTART IDENTITY resets the ID sequences.
+
+                    logger.info("  [1/1] Truncating all tables and resetting ID sequences...")
+                    session.execute(TRUNCATE_SQL)
+                    session.commit()
+                    logger.info("     ✅ All tables truncated, ID sequences reset to 1")
+
+                profiles_count = counts.get("profiles", 0)
+                posts_count = counts.get("posts", 0)
+                profile_history_count = counts.get("profile_history", 0)
+                post_history_count = counts.get("post_history", 0)
+                alert_count = counts.get("alert_logs", 0)
+
+                logger.info("")
+                logger.info("=" * 70)
+                logger.info("🎉 DATABASE RESET COMPLETE")
+                logger.info("=" * 70)
+                logger.info("")
+                logger.info("Total records deleted:")
+                logger.info("  - Profiles: %s%d", approx, profiles_count)
+                logger.info("  - Posts: %s%d", approx, posts_count)
+                logger.info("  - Profile History: %s%d", approx, profile_history_count)
+                logger.info("  - Post History: %s%d", approx, post_history_count)
+                logger.info("  - Alert Logs: %s%d", approx, alert_count)
+                logger.info("")
+                logger.info("✅ Database is now empty and ready for fresh data")
+
+                return True
+
+            except Exception as e:
+                session.rollback()
+                logger.error("❌ Reset failed: %s", e)
+                raise
 
     except Exception as e:
-        logger.error(f"❌ Database reset failed: {e}")
+        logger.error("❌ Database reset failed: %s", e)
         import traceback
         traceback.print_exc()
         return False
@@ -183,7 +385,25 @@ if __name__ == "__main__":
         action="store_true",
         help="Skip confirmation prompt (dangerous!)"
     )
+    parser.add_argument(
+        "--online",
+        action="store_true",
+        help="Delete in small batches instead of TRUNCATE (app can stay up)"
+    )
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per batch with --online")
+    parser.add_argument("--pause-ms", type=int, default=100, help="Pause between batches with --online")
+    parser.add_argument(
+        "--drop-fks",
+        action="store_true",
+        help="With --online, drop foreign keys during the deletes and restore them after"
+    )
     args = parser.parse_args()
 
-    success = reset_all_data(confirm=args.confirm)
+    success = reset_all_data(
+        confirm=args.confirm,
+        online=args.online,
+        batch_size=args.batch_size,
+        pause_ms=args.pause_ms,
+        drop_fks=args.drop_fks
+    )
     sys.exit(0 if success else 1)
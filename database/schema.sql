@@ -28,7 +28,7 @@ END $$;
 -- ===========================================
 
 CREATE TABLE IF NOT EXISTS profiles (
-    id SERIAL PRIMARY KEY,
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
     
     -- Platform identification
     platform platform_type NOT NULL DEFAULT 'tiktok',
@@ -59,8 +59,8 @@ CREATE TABLE IF NOT EXISTS profiles (
     
     -- Tracking flags
     is_active BOOLEAN DEFAULT TRUE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    updated_at TIMESTAMPTZ DEFAULT now(),
     last_scraped_at TIMESTAMP,
     
     -- Constraints
@@ -69,7 +69,6 @@ CREATE TABLE IF NOT EXISTS profiles (
 );
 
 -- Indexes
-CREATE INDEX IF NOT EXISTS idx_profiles_username ON profiles(username);
 CREATE INDEX IF NOT EXISTS idx_profiles_platform ON profiles(platform);
 CREATE INDEX IF NOT EXISTS idx_profiles_active ON profiles(is_active);
 CREATE INDEX IF NOT EXISTS idx_profiles_active_platform ON profiles(is_active, platform);
@@ -80,8 +79,8 @@ CREATE INDEX IF NOT EXISTS idx_profiles_active_platform ON profiles(is_active, p
 -- ===========================================
 
 CREATE TABLE IF NOT EXISTS profile_history (
-    id SERIAL PRIMARY KEY,
-    profile_id INTEGER REFERENCES profiles(id) ON DELETE CASCADE,
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    profile_id BIGINT REFERENCES profiles(id) ON DELETE CASCADE,
     
     -- Common metrics snapshot
     follower_count BIGINT DEFAULT 0,
@@ -101,7 +100,11 @@ CREATE TABLE IF NOT EXISTS profile_history (
 );
 
 CREATE INDEX IF NOT EXISTS idx_profile_history_lookup 
-    ON profile_history(profile_id, recorded_at);
+    ON profile_history(profile_id, recorded_at DESC)
+    INCLUDE (follower_count, following_count, total_likes, video_count,
+             follower_change, subreddit_subscribers, active_users);
+CREATE INDEX IF NOT EXISTS idx_profile_history_recorded_brin
+    ON profile_history USING brin (recorded_at) WITH (pages_per_range = 64);
 
 
 -- ===========================================
@@ -109,8 +112,8 @@ CREATE INDEX IF NOT EXISTS idx_profile_history_lookup
 -- ===========================================
 
 CREATE TABLE IF NOT EXISTS posts (
-    id SERIAL PRIMARY KEY,
-    profile_id INTEGER REFERENCES profiles(id) ON DELETE CASCADE,
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    profile_id BIGINT REFERENCES profiles(id) ON DELETE CASCADE,
     
     -- Platform identification
     platform platform_type NOT NULL DEFAULT 'tiktok',
@@ -146,17 +149,17 @@ CREATE TABLE IF NOT EXISTS posts (
     
     -- Timestamps
     posted_at TIMESTAMP,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    updated_at TIMESTAMPTZ DEFAULT now(),
     
     -- Constraints
     CONSTRAINT uq_post_platform_id UNIQUE (platform_post_id, platform)
 );
 
 -- Indexes
-CREATE INDEX IF NOT EXISTS idx_posts_platform_post_id ON posts(platform_post_id);
-CREATE INDEX IF NOT EXISTS idx_posts_profile_posted ON posts(profile_id, posted_at);
-CREATE INDEX IF NOT EXISTS idx_posts_viral ON posts(is_viral, viral_alert_sent);
+CREATE INDEX IF NOT EXISTS idx_posts_profile_posted ON posts(profile_id, posted_at DESC)
+    INCLUDE (view_count, like_count, comment_count, share_count, is_viral);
+CREATE INDEX IF NOT EXISTS idx_posts_viral_pending ON posts(profile_id) WHERE is_viral AND NOT viral_alert_sent;
 CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts(platform);
 
 
@@ -165,8 +168,8 @@ CREATE INDEX IF NOT EXISTS idx_posts_platform ON posts(platform);
 -- ===========================================
 
 CREATE TABLE IF NOT EXISTS post_history (
-    id SERIAL PRIMARY KEY,
-    post_id INTEGER REFERENCES posts(id) ON DELETE CASCADE,
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    post_id BIGINT REFERENCES posts(id) ON DELETE CASCADE,
     
     -- Common metrics snapshot
     view_count BIGINT DEFAULT 0,
@@ -186,7 +189,10 @@ CREATE TABLE IF NOT EXISTS post_history (
 );
 
 CREATE INDEX IF NOT EXISTS idx_post_history_lookup 
-    ON post_history(post_id, recorded_at);
+    ON post_history(post_id, recorded_at DESC)
+    INCLUDE (view_count, like_count, comment_count, share_count);
+CREATE INDEX IF NOT EXISTS idx_post_history_recorded_brin
+    ON post_history USING brin (recorded_at) WITH (pages_per_range = 64);
 
 
 -- ===========================================
@@ -194,9 +200,9 @@ CREATE INDEX IF NOT EXISTS idx_post_history_lookup
 -- ===========================================
 
 CREATE TABLE IF NOT EXISTS alert_logs (
-    id SERIAL PRIMARY KEY,
-    post_id INTEGER REFERENCES posts(id) ON DELETE SET NULL,
-    profile_id INTEGER REFERENCES profiles(id) ON DELETE SET NULL,
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    post_id BIGINT REFERENCES posts(id) ON DELETE SET NULL,
+    profile_id BIGINT REFERENCES profiles(id) ON DELETE SET NULL,
     
     -- Platform context
     platform platform_type,
@@ -214,6 +220,28 @@ CREATE INDEX IF NOT EXISTS idx_alert_logs_sent ON alert_logs(sent_at);
 CREATE INDEX IF NOT EXISTS idx_alert_logs_platform ON alert_logs(platform);
 
 
+-- ===========================================
+-- UPDATED_AT TRIGGERS
+-- ===========================================
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = now();
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_profiles_updated_at ON profiles;
+CREATE TRIGGER trg_profiles_updated_at
+    BEFORE UPDATE ON profiles
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS trg_posts_updated_at ON posts;
+CREATE TRIGGER trg_posts_updated_at
+    BEFORE UPDATE ON posts
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+
 -- ============================================
 -- VIEWS FOR DASHBOARD QUERIES
 -- ============================================
@@ -11,6 +11,42 @@ Requires DATABASE_URL environment variable to be set.
 import os
 import sys
 
+try:
+    from sqlalchemy import text
+
+    from database.engine import get_engine
+except ImportError:
+    # Reported with install instructions by run_migration()
+    get_engine = text = None
+
+
+# (column, type, default) added to each table
+PROFILE_COLUMNS = [
+    # Platform column (defaults to 'tiktok' for existing records)
+    ("platform", "VARCHAR(32)", "'tiktok'"),
+    # Platform user ID (renamed from tiktok_user_id conceptually)
+    ("platform_user_id", "VARCHAR(64)", "NULL"),
+    # User role for analytics
+    ("user_role", "VARCHAR(32)", "'creator'"),
+    # Reddit-specific columns
+    ("subreddit_name", "VARCHAR(128)", "NULL"),
+    ("subreddit_subscribers", "BIGINT", "NULL"),
+    ("active_users", "INTEGER", "NULL"),
+]
+
+POST_COLUMNS = [
+    # Platform column (defaults to 'tiktok' for existing records)
+    ("platform", "VARCHAR(32)", "'tiktok'"),
+    # Reddit-specific columns
+    ("upvote_ratio", "FLOAT", "NULL"),
+    ("is_crosspost", "BOOLEAN", "NULL"),
+    ("original_subreddit", "VARCHAR(128)", "NULL"),
+    # Twitter-specific columns
+    ("retweet_count", "BIGINT", "NULL"),
+    ("quote_count", "BIGINT", "NULL"),
+]
+
+
 def get_database_url():
     """Get database URL from environment."""
     database_url = os.getenv("DATABASE_URL", "")
@@ -26,43 +62,38 @@ def get_database_url():
     return database_url
 
 
-def column_exists(connection, table_name, column_name):
-    """Check if a column exists in a table."""
-    from sqlalchemy import text
-    
-    result = connection.execute(text("""
-        SELECT column_name 
-        FROM information_schema.columns 
-        WHERE table_name = :table AND column_name = :column
-    """), {"table": table_name, "column": column_name})
-    
-    return result.fetchone() is not None
+def add_columns_if_not_exist(connection, table_name, columns):
+    """
+    Add any missing columns to a table with a single ALTER TABLE.
 
+    ADD COLUMN IF NOT EXISTS (PostgreSQL 9.6+) makes the statement idempotent,
+    so there is no catalog lookup beforehand; existing columns are skipped
+    by the server with a NOTICE.
 
-def add_column_if_not_exists(connection, table_name, column_name, column_type, default=None):
-    """Add a column to a table if it doesn't exist."""
-    from sqlalchemy import text
-    
-    if column_exists(connection, table_name, column_name):
-        print(f"  ✓ {table_name}.{column_name} already exists")
-        return False
-    
-    # Build the ALTER TABLE statement
-    sql = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"
-    if default is not None:
-        sql += f" DEFAULT {default}"
-    
-    connection.execute(text(sql))
-    print(f"  + Added {table_name}.{column_name} ({column_type})")
-    return True
+    DDL can't take bind parameters, so table and column names go through the
+    dialect's identifier quoting; types and defaults only ever come from the
+    constant lists above.
+
+    Args:
+        columns: List of (column_name, column_type, default) tuples
+    """
+    quote = connection.dialect.identifier_preparer.quote
+    clauses = []
+    for column_name, column_type, default in columns:
+        clause = f"ADD COLUMN IF NOT EXISTS {quote(column_name)} {column_type}"
+        if default is not None:
+            clause += f" DEFAULT {default}"
+        clauses.append(clause)
+        print(f"  ✓ {table_name}.{column_name} ({column_type})")
+
+    # One ACCESS EXCLUSIVE lock and catalog update per table instead of per column
+    connection.execute(text(f"ALTER TABLE {quote(table_name)} " + ", ".join(clauses)))
 
 
 def run_migration():
     """Run the v0.0.2 migration."""
     
-    try:
-        from sqlalchemy import create_engine, text
-    except ImportError:
+    if get_engine is None:
         print("ERROR: SQLAlchemy not installed. Run: pip install sqlalchemy psycopg2-binary")
         sys.exit(1)
     
@@ -78,107 +109,35 @@ def run_migration():
     print(f"Database: {display_url}")
     print()
     
-    engine = create_engine(database_url)
+    engine = get_engine(database_url)
     
-    with engine.connect() as connection:
-        # Start transaction
-        trans = connection.begin()
-        
-        try:
+    try:
+        # Commits on a clean exit, rolls back if anything raises
+        with engine.begin() as connection:
             # =========================================================
             # PROFILES TABLE
             # =========================================================
             print("[1/2] Updating 'profiles' table...")
-            
-            # Platform column (defaults to 'tiktok' for existing records)
-            add_column_if_not_exists(
-                connection, "profiles", "platform", 
-                "VARCHAR(32)", "'tiktok'"
-            )
-            
-            # Platform user ID (renamed from tiktok_user_id conceptually)
-            add_column_if_not_exists(
-                connection, "profiles", "platform_user_id", 
-                "VARCHAR(64)", "NULL"
-            )
-            
-            # User role for analytics
-            add_column_if_not_exists(
-                connection, "profiles", "user_role", 
-                "VARCHAR(32)", "'creator'"
-            )
-            
-            # Reddit-specific columns
-            add_column_if_not_exists(
-                connection, "profiles", "subreddit_name", 
-                "VARCHAR(128)", "NULL"
-            )
-            
-            add_column_if_not_exists(
-                connection, "profiles", "subreddit_subscribers", 
-                "BIGINT", "NULL"
-            )
-            
-            add_column_if_not_exists(
-                connection, "profiles", "active_users", 
-                "INTEGER", "NULL"
-            )
-            
+            add_columns_if_not_exist(connection, "profiles", PROFILE_COLUMNS)
             print()
             
             # =========================================================
             # POSTS TABLE
             # =========================================================
             print("[2/2] Updating 'posts' table...")
-            
-            # Platform column (defaults to 'tiktok' for existing records)
-            add_column_if_not_exists(
-                connection, "posts", "platform", 
-                "VARCHAR(32)", "'tiktok'"
-            )
-            
-            # Reddit-specific columns
-            add_column_if_not_exists(
-                connection, "posts", "upvote_ratio", 
-                "FLOAT", "NULL"
-            )
-            
-            add_column_if_not_exists(
-                connection, "posts", "is_crosspost", 
-                "BOOLEAN", "NULL"
-            )
-            
-            add_column_if_not_exists(
-                connection, "posts", "original_subreddit", 
-                "VARCHAR(128)", "NULL"
-            )
-            
-            # Twitter-specific columns
-            add_column_if_not_exists(
-                connection, "posts", "retweet_count", 
-                "BIGINT", "NULL"
-            )
-            
-            add_column_if_not_exists(
-                connection, "posts", "quote_count", 
-                "BIGINT", "NULL"
-            )
-            
-            # Commit the transaction
-            trans.commit()
-            
-            print()
-            print("=" * 60)
-            print("✅ Migration v0.0.2 completed successfully!")
-            print("   All existing data preserved with platform='tiktok'")
-            print("=" * 60)
-            
-        except Exception as e:
-            trans.rollback()
-            print()
-            print(f"❌ Migration failed: {e}")
-            print("   Transaction rolled back - no changes made.")
-            raise
+            add_columns_if_not_exist(connection, "posts", POST_COLUMNS)
+        
+        print()
+        print("=" * 60)
+        print("✅ Migration v0.0.2 completed successfully!")
+        print("   All existing data preserved with platform='tiktok'")
+        print("=" * 60)
+        
+    except Exception as e:
+        print()
+        print(f"❌ Migration failed: {e}")
+        print("   Transaction rolled back - no changes made.")
+        raise
 
 
 if __name__ == "__main__":
@@ -26,12 +26,13 @@ Usage:
 """
 
 import asyncio
+import itertools
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Protocol
-from statistics import mean
 
-from sqlalchemy import select, update
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from config import config
@@ -50,6 +51,48 @@ from services.logger import get_logger, log_scrape_result, log_viral_alert
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Columns a refresh reads before fetching. Bulk updates select them for every
+# profile in one query and hand each row to update_profile_by_id().
+PROFILE_STATE_COLUMNS = (
+    Profile.id, Profile.username, Profile.platform_user_id,
+    Profile.follower_count, Profile.total_likes, Profile.average_post_views
+)
+
+# Rows per server-side cursor fetch when listing profiles for a bulk update
+PROFILE_FETCH_CHUNK = 1000
+
+# Telegram sends in flight at once per scraper (queued alerts wait their turn)
+MAX_CONCURRENT_ALERTS = 4
+
+
+@lru_cache(maxsize=4096)
+def _normalize_handle(username: str) -> str:
+    """Canonical form of a user-supplied handle ('@Name ' -> 'name')."""
+    return username.lstrip("@").strip().lower()
+
+
+class RateLimiter:
+    """
+    Spaces out acquisitions so at most `rate` start per second.
+
+    Shared by every task of a bulk update, so the pace holds globally however
+    many updates run concurrently; a task only waits when it would otherwise
+    exceed the rate.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for the next free slot."""
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        # Reserved before sleeping, so concurrent callers queue up behind it
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
 
 # =============================================================================
 # ABSTRACT BASE SCRAPER
@@ -68,6 +111,14 @@ class BaseScraper(ABC):
         self.viral_threshold = config.VIRAL_THRESHOLD_MULTIPLIER
         self.lookback_days = config.POSTS_LOOKBACK_DAYS
 
+        # Background viral-alert sends, see flush_alerts()
+        self._alert_tasks: set[asyncio.Task] = set()
+        self._alert_sem = asyncio.Semaphore(MAX_CONCURRENT_ALERTS)
+        self._alert_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Paces bulk updates against the platform API, see RateLimiter
+        self.rate_limiter = RateLimiter(config.UPDATES_PER_SECOND)
+
     @property
     @abstractmethod
     def platform_name(self) -> str:
@@ -85,10 +136,39 @@ class BaseScraper(ABC):
         pass
 
     @abstractmethod
-    async def update_profile_by_id(self, profile_id: int) -> Optional[Profile]:
-        """Update a profile using database ID."""
+    async def update_profile_by_id(self, profile_id: int, state=None) -> Optional[Profile]:
+        """Update a profile using database ID (and its preloaded state row, if any)."""
         pass
 
+    async def flush_alerts(self) -> None:
+        """
+        Wait for every queued alert task to finish.
+
+        Refreshes hand viral alerts off as background tasks so they don't
+        hold up the next profile; call this before the event loop shuts
+        down (e.g. at the end of a bulk update) so none are cancelled.
+        """
+        if self._alert_tasks:
+            await asyncio.gather(*self._alert_tasks, return_exceptions=True)
+
+    def _spawn_alert(self, coro) -> None:
+        """Run an alert coroutine as a tracked background task."""
+        # Scrapers are shared (see ScraperFactory) and an asyncio semaphore
+        # can't be awaited from another loop, so each loop gets its own
+        loop = asyncio.get_running_loop()
+        if self._alert_loop is not loop:
+            self._alert_sem = asyncio.Semaphore(MAX_CONCURRENT_ALERTS)
+            self._alert_loop = loop
+
+        task = asyncio.create_task(coro)
+        self._alert_tasks.add(task)
+        task.add_done_callback(self._alert_tasks.discard)
+
+    async def aclose(self) -> None:
+        """Finish pending alerts and close this scraper's HTTP clients."""
+        await self.flush_alerts()
+        await self.telegram.aclose()
+
     async def remove_profile(self, username: str) -> bool:
         """
         Soft-delete a profile from the watchlist (platform-agnostic).
@@ -99,20 +179,26 @@ class BaseScraper(ABC):
         Returns:
             True if removed, False if not found
         """
-        username = username.lstrip("@").strip().lower()
+        username = _normalize_handle(username)
 
         with get_db_context() as db:
-            profile = db.query(Profile).filter(
-                Profile.username == username,
-                Profile.platform == self.platform_name
-            ).first()
-            if profile:
-                profile.is_active = False
-                db.commit()
-                logger.info(f"🗑️ Removed @{username} ({self.platform_name}) from watchlist")
-                return True
+            # One UPDATE ... RETURNING instead of SELECT-then-UPDATE
+            removed_id = db.execute(
+                update(Profile)
+                .where(
+                    Profile.username == username,
+                    Profile.platform == self.platform_name
+                )
+                .values(is_active=False)
+                .returning(Profile.id)
+            ).scalar()
+            db.commit()
+
+        if removed_id is None:
+            return False
 
-        return False
+        logger.info(f"🗑️ Removed @{username} ({self.platform_name}) from watchlist")
+        return True
 
 
 class TikTokScraper(BaseScraper):
@@ -131,6 +217,11 @@ class TikTokScraper(BaseScraper):
     def __init__(self):
         super().__init__()
         self.tiktok = TikTokClient()
+
+    async def aclose(self) -> None:
+        """Close the TikTok API client along with the base resources."""
+        await super().aclose()
+        await self.tiktok.aclose()
     
     # =========================================================================
     # PUBLIC METHODS
@@ -152,21 +243,15 @@ class TikTokScraper(BaseScraper):
         Returns:
             Created Profile database object
         """
-        username = username.lstrip("@").strip().lower()
+        username = _normalize_handle(username)
         logger.info(f"📥 Adding new profile: @{username}")
         
-        # Check if already exists
-        with get_db_context() as db:
-            existing = db.query(Profile).filter(Profile.username == username).first()
-            if existing:
-                # Reactivate if it was soft-deleted
-                if not existing.is_active:
-                    existing.is_active = True
-                    db.commit()
-                    logger.info(f"Profile @{username} reactivated")
-                
-                logger.warning(f"Profile @{username} already exists, updating instead")
-                return await self.update_profile(username)
+        # Check if already exists (reactivating it if it was soft-deleted)
+        if await asyncio.to_thread(self._reactivate_existing, username):
+            logger.warning(f"Profile @{username} already exists, updating instead")
+            profile = await self.update_profile(username)
+            await self.flush_alerts()
+            return profile
         
         # Step 1: Fetch profile (gets secUid)
         try:
@@ -193,78 +278,29 @@ class TikTokScraper(BaseScraper):
         logger.info(f"📊 Calculated avg views: {avg_views:,.0f} from {len(posts_data)} posts")
 
         # Save to database (including secUid for future use)
-        with get_db_context() as db:
-            profile = Profile(
-                tiktok_user_id=user_id,  # IMPORTANT: Save secUid for subsequent API calls
-                username=profile_data.username,
-                display_name=profile_data.display_name,
-                bio=profile_data.bio,
-                avatar_url=profile_data.avatar_url,
-                follower_count=profile_data.follower_count,
-                following_count=profile_data.following_count,
-                total_likes=profile_data.total_likes,
-                video_count=profile_data.video_count,
-                average_post_views=avg_views,
-                last_scraped_at=datetime.utcnow()
-            )
-            db.add(profile)
-            db.flush()  # Get the ID
-
-            logger.info(f"💾 Saved profile with ID: {profile.id}")
-
-            # Create initial history record
-            history = ProfileHistory(
-                profile_id=profile.id,
-                follower_count=profile.follower_count,
-                following_count=profile.following_count,
-                total_likes=profile.total_likes,
-                video_count=profile.video_count,
-                follower_change=0,
-                likes_change=0,
-                recorded_at=datetime.utcnow()
-            )
-            db.add(history)
-
-            # Insert posts
-            logger.info(f"💾 Saving {len(posts_data)} posts to database...")
-            posts_saved = 0
-            for post_data in posts_data:
-                post = self._create_post_record(profile.id, post_data, avg_views)
-                db.add(post)
-                posts_saved += 1
-
-            logger.debug(f"   Added {posts_saved} post records to session")
-
-            db.commit()
-
-            logger.info(f"✅ Database commit successful - profile and {posts_saved} posts saved")
-
-            # Capture values BEFORE session closes (fix for detached instance error)
-            saved_username = profile.username
-            saved_follower_count = profile.follower_count
+        profile = await asyncio.to_thread(
+            self._save_new_profile, profile_data, posts_data, avg_views
+        )
 
-            logger.info(
-                f"✅ Added @{username} | "
-                f"secUid: {user_id[:20]}... | "
-                f"{profile.follower_count:,} followers | "
-                f"{len(posts_data)} posts | "
-                f"Avg views: {avg_views:,.0f}"
-            )
-            
-            # Send welcome notification
-            if send_notification:
-                try:
-                    await self.telegram.send_welcome_alert(
-                        username=saved_username,
-                        follower_count=saved_follower_count
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to send welcome notification: {e}")
-            
-            # Expunge the profile from session so it can be used after context closes
-            db.expunge(profile)
-            
-            return profile
+        logger.info(
+            f"✅ Added @{username} | "
+            f"secUid: {user_id[:20]}... | "
+            f"{profile.follower_count:,} followers | "
+            f"{len(posts_data)} posts | "
+            f"Avg views: {avg_views:,.0f}"
+        )
+        
+        # Send welcome notification
+        if send_notification:
+            try:
+                await self.telegram.send_welcome_alert(
+                    username=profile.username,
+                    follower_count=profile.follower_count
+                )
+            except Exception as e:
+                logger.warning(f"Failed to send welcome notification: {e}")
+        
+        return profile
     
     async def update_profile(self, username: str) -> Optional[Profile]:
         """
@@ -278,21 +314,21 @@ class TikTokScraper(BaseScraper):
         Returns:
             Updated Profile object or None if not found
         """
-        username = username.lstrip("@").strip().lower()
+        username = _normalize_handle(username)
         logger.info(f"🔄 Updating profile: @{username}")
         
         # Get existing profile with cached user_id
-        with get_db_context() as db:
-            profile = db.query(Profile).filter(Profile.username == username).first()
-            if not profile:
-                logger.warning(f"Profile @{username} not found in database")
-                return None
-            
-            profile_id = profile.id
-            cached_user_id = profile.tiktok_user_id  # Use cached user_id!
-            old_follower_count = profile.follower_count
-            old_likes = profile.total_likes
-            old_avg_views = profile.average_post_views
+        state = await asyncio.to_thread(
+            self._load_profile_state,
+            Profile.username == username,
+            Profile.platform == self.platform_name
+        )
+        if not state:
+            logger.warning(f"Profile @{username} not found in database")
+            return None
+        
+        profile_id = state.id
+        cached_user_id = state.platform_user_id  # Use cached user_id!
         
         # Fetch fresh data
         try:
@@ -324,63 +360,23 @@ class TikTokScraper(BaseScraper):
         # Calculate new average views
         new_avg_views = self._calculate_average_views(posts_data)
         
-        with get_db_context() as db:
-            profile = db.query(Profile).filter(Profile.id == profile_id).first()
-
-            # Update profile metrics (including secUid in case it changed)
-            profile.tiktok_user_id = user_id  # Always update to latest secUid
-            profile.display_name = profile_data.display_name
-            profile.bio = profile_data.bio
-            profile.avatar_url = profile_data.avatar_url
-            profile.follower_count = profile_data.follower_count
-            profile.following_count = profile_data.following_count
-            profile.total_likes = profile_data.total_likes
-            profile.video_count = profile_data.video_count
-            profile.average_post_views = new_avg_views
-            profile.last_scraped_at = datetime.utcnow()
-            
-            # Create history snapshot
-            history = ProfileHistory(
-                profile_id=profile.id,
-                follower_count=profile.follower_count,
-                following_count=profile.following_count,
-                total_likes=profile.total_likes,
-                video_count=profile.video_count,
-                follower_change=profile.follower_count - old_follower_count,
-                likes_change=profile.total_likes - old_likes,
-                recorded_at=datetime.utcnow()
-            )
-            db.add(history)
-            
-            # UPSERT posts and check for viral content
-            viral_posts = []
-            for post_data in posts_data:
-                is_new, is_viral, post = await self._upsert_post(
-                    db, profile.id, post_data, old_avg_views
-                )
-                if is_viral:
-                    viral_posts.append((post_data, post))
-            
-            db.commit()
-            
-            logger.info(
-                f"✅ Updated @{username} | "
-                f"Followers: {profile.follower_count:,} ({profile.follower_count - old_follower_count:+,}) | "
-                f"Viral posts detected: {len(viral_posts)}"
-            )
-            
-            # Send viral alerts
-            for post_data, post_record in viral_posts:
-                await self._send_viral_alert(
-                    db, profile, post_data, post_record, old_avg_views
-                )
-            
-            # Expunge profile so it can be accessed after session closes
-            db.expunge(profile)
-            
-            return profile
+        # Update profile metrics (including secUid in case it changed)
+        profile, viral_posts = await asyncio.to_thread(
+            self._save_refresh, state, user_id, profile_data, posts_data, new_avg_views
+        )
+        
+        logger.info(
+            f"✅ Updated @{username} | "
+            f"Followers: {profile.follower_count:,} ({profile.follower_count - state.follower_count:+,}) | "
+            f"Viral posts detected: {len(viral_posts)}"
+        )
+        
+        # Send viral alerts in the background; the refresh is already committed
+        self._queue_viral_alerts(profile, viral_posts, state.average_post_views)
+        
+        return profile
     
-    async def update_profile_by_id(self, profile_id: int) -> Optional[Profile]:
+    async def update_profile_by_id(self, profile_id: int, state=None) -> Optional[Profile]:
         """
         Update a profile using database ID and cached user_id.
         
@@ -388,22 +384,21 @@ class TikTokScraper(BaseScraper):
         
         Args:
             profile_id: Database profile ID
+            state: Row of PROFILE_STATE_COLUMNS already loaded by a bulk
+                   update; read from the database when omitted
             
         Returns:
             Updated Profile object or None if not found
         """
         # Get profile with cached data
-        with get_db_context() as db:
-            profile = db.query(Profile).filter(Profile.id == profile_id).first()
-            if not profile:
-                logger.warning(f"Profile ID {profile_id} not found")
-                return None
-            
-            username = profile.username
-            cached_user_id = profile.tiktok_user_id
-            old_follower_count = profile.follower_count
-            old_likes = profile.total_likes
-            old_avg_views = profile.average_post_views
+        if state is None:
+            state = await asyncio.to_thread(self._load_profile_state, Profile.id == profile_id)
+        if not state:
+            logger.warning(f"Profile ID {profile_id} not found")
+            return None
+        
+        username = state.username
+        cached_user_id = state.platform_user_id
         
         logger.info(f"🔄 Updating profile: @{username} (ID: {profile_id})")
         
@@ -439,61 +434,21 @@ class TikTokScraper(BaseScraper):
         # Calculate new average
         new_avg_views = self._calculate_average_views(posts_data)
 
-        with get_db_context() as db:
-            profile = db.query(Profile).filter(Profile.id == profile_id).first()
-
-            # Update all fields (including secUid)
-            profile.tiktok_user_id = cached_user_id or user_id  # Store secUid
-            profile.display_name = profile_data.display_name
-            profile.bio = profile_data.bio
-            profile.avatar_url = profile_data.avatar_url
-            profile.follower_count = profile_data.follower_count
-            profile.following_count = profile_data.following_count
-            profile.total_likes = profile_data.total_likes
-            profile.video_count = profile_data.video_count
-            profile.average_post_views = new_avg_views
-            profile.last_scraped_at = datetime.utcnow()
-            
-            # History snapshot
-            history = ProfileHistory(
-                profile_id=profile.id,
-                follower_count=profile.follower_count,
-                following_count=profile.following_count,
-                total_likes=profile.total_likes,
-                video_count=profile.video_count,
-                follower_change=profile.follower_count - old_follower_count,
-                likes_change=profile.total_likes - old_likes,
-                recorded_at=datetime.utcnow()
-            )
-            db.add(history)
-            
-            # UPSERT posts
-            viral_posts = []
-            for post_data in posts_data:
-                is_new, is_viral, post = await self._upsert_post(
-                    db, profile.id, post_data, old_avg_views
-                )
-                if is_viral:
-                    viral_posts.append((post_data, post))
-            
-            db.commit()
-            
-            logger.info(
-                f"✅ Updated @{username} | "
-                f"Followers: {profile.follower_count:,} ({profile.follower_count - old_follower_count:+,}) | "
-                f"Viral: {len(viral_posts)}"
-            )
-            
-            # Send viral alerts
-            for post_data, post_record in viral_posts:
-                await self._send_viral_alert(
-                    db, profile, post_data, post_record, old_avg_views
-                )
-            
-            # Expunge profile so it can be accessed after session closes
-            db.expunge(profile)
-            
-            return profile
+        # Update all fields (including secUid)
+        profile, viral_posts = await asyncio.to_thread(
+            self._save_refresh, state, cached_user_id or user_id, profile_data, posts_data, new_avg_views
+        )
+        
+        logger.info(
+            f"✅ Updated @{username} | "
+            f"Followers: {profile.follower_count:,} ({profile.follower_count - state.follower_count:+,}) | "
+            f"Viral: {len(viral_posts)}"
+        )
+        
+        # Send viral alerts in the background; the refresh is already committed
+        self._queue_viral_alerts(profile, viral_posts, state.average_post_views)
+        
+        return profile
     
     async def update_all_profiles(self) -> dict:
         """
@@ -507,30 +462,41 @@ class TikTokScraper(BaseScraper):
         """
         logger.info("🔄 Starting bulk update for all profiles...")
         
-        # Get all active profile IDs and usernames
+        # Refresh state for every active profile in one SELECT (plain rows,
+        # no ORM objects), so the updates below skip their per-profile read
         with get_db_context() as db:
-            profiles = db.query(Profile).filter(Profile.is_active == True).all()
-            profile_data = [(p.id, p.username, p.tiktok_user_id) for p in profiles]
+            profile_data = db.execute(
+                select(*PROFILE_STATE_COLUMNS)
+                .where(Profile.is_active.is_(True))
+            ).all()
         
         results = {"success": 0, "failed": 0, "viral_alerts": 0}
-        
-        for profile_id, username, user_id in profile_data:
-            try:
-                if user_id:
+
+        # Updates are network-bound, so overlap them up to the concurrency cap
+        sem = asyncio.Semaphore(config.MAX_CONCURRENT_UPDATES)
+
+        async def _one(state):
+            async with sem:
+                await self.rate_limiter.acquire()
+                if state.platform_user_id:
                     # Use efficient method with cached user_id
-                    await self.update_profile_by_id(profile_id)
+                    await self.update_profile_by_id(state.id, state)
                 else:
                     # Fallback to username-based update
-                    await self.update_profile(username)
-                    
-                results["success"] += 1
-            except Exception as e:
-                logger.error(f"Failed to update @{username}: {e}")
+                    await self.update_profile(state.username)
+
+        outcomes = await asyncio.gather(
+            *[_one(state) for state in profile_data], return_exceptions=True
+        )
+        await self.flush_alerts()
+
+        for state, outcome in zip(profile_data, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to update @{state.username}: {outcome}")
                 results["failed"] += 1
-            
-            # Rate limiting - wait between requests
-            await asyncio.sleep(2)
-        
+            else:
+                results["success"] += 1
+
         logger.info(
             f"✅ Bulk update complete: "
             f"{results['success']} success, {results['failed']} failed"
@@ -538,28 +504,171 @@ class TikTokScraper(BaseScraper):
         
         return results
     
-    async def remove_profile(self, username: str) -> bool:
+    # =========================================================================
+    # DATABASE HELPERS
+    # =========================================================================
+    # These are synchronous and are awaited via asyncio.to_thread(), so a DB
+    # round-trip never blocks the event loop while other profiles are being
+    # fetched. Each opens and closes its own session in the worker thread.
+
+    def _reactivate_existing(self, username: str) -> bool:
+        """Reactivate a soft-deleted profile; return True if the profile exists."""
+        with get_db_context() as db:
+            existing = db.query(Profile).filter(
+                Profile.username == username,
+                Profile.platform == self.platform_name
+            ).first()
+            if existing and not existing.is_active:
+                # Committed on context exit
+                existing.is_active = True
+                logger.info(f"Profile @{username} reactivated")
+            return existing is not None
+
+    def _load_profile_state(self, *criteria):
+        """Read the columns a refresh needs from the matching profile (None if missing)."""
+        with get_db_context() as db:
+            return db.execute(select(*PROFILE_STATE_COLUMNS).where(*criteria)).first()
+
+    def _save_new_profile(self, profile_data: TikTokProfile, posts_data: list[TikTokPost], avg_views: float) -> Profile:
+        """Insert a new profile with its first history snapshot and posts."""
+        now = datetime.utcnow()  # One timestamp for every row of this save
+
+        with get_db_context() as db:
+            # INSERT ... RETURNING hands back the complete row (id and server
+            # defaults) in the same round-trip - no flush or refresh needed
+            profile = db.scalars(insert(Profile).values(
+                platform_user_id=profile_data.user_id,  # IMPORTANT: Save secUid for subsequent API calls
+                username=profile_data.username,
+                display_name=profile_data.display_name,
+                bio=profile_data.bio,
+                avatar_url=profile_data.avatar_url,
+                follower_count=profile_data.follower_count,
+                following_count=profile_data.following_count,
+                total_likes=profile_data.total_likes,
+                video_count=profile_data.video_count,
+                average_post_views=avg_views,
+                last_scraped_at=now
+            ).returning(Profile)).one()
+
+            logger.info(f"💾 Saved profile with ID: {profile.id}")
+
+            # Create initial history record (append-only log: Core insert)
+            db.execute(insert(ProfileHistory).values(
+                profile_id=profile.id,
+                follower_count=profile.follower_count,
+                following_count=profile.following_count,
+                total_likes=profile.total_likes,
+                video_count=profile.video_count,
+                follower_change=0,
+                likes_change=0,
+                recorded_at=now
+            ))
+
+            # Insert posts: one compiled INSERT executed for every row
+            # (executemany), bypassing ORM unit-of-work bookkeeping
+            logger.info(f"💾 Saving {len(posts_data)} posts to database...")
+            threshold = avg_views * self.viral_threshold
+            post_rows = [
+                self._post_values(profile.id, post_data, post_data.view_count > threshold)
+                for post_data in posts_data
+            ]
+            if post_rows:
+                db.execute(insert(Post.__table__), post_rows)
+            posts_saved = len(post_rows)
+
+            logger.debug(f"   Inserted {posts_saved} post rows")
+
+            # Detach before the commit expires it, so its loaded values stay usable
+            db.expunge(profile)
+
+            db.commit()
+
+            logger.info(f"✅ Database commit successful - profile and {posts_saved} posts saved")
+
+            return profile
+
+    def _save_refresh(
+        self,
+        state,
+        platform_user_id: str,
+        profile_data: TikTokProfile,
+        posts_data: list[TikTokPost],
+        new_avg_views: float
+    ) -> tuple[Profile, list[tuple[TikTokPost, int]]]:
         """
-        Soft-delete a profile from the watchlist.
-        
+        Write a refresh in one transaction: profile metrics, a history
+        snapshot and the post upsert.
+
         Args:
-            username: TikTok handle
-            
+            state: Row from _load_profile_state() taken before the fetch
+
         Returns:
-            True if removed, False if not found
+            Tuple of (detached profile, viral posts needing an alert)
         """
-        username = username.lstrip("@").strip().lower()
-        
+        now = datetime.utcnow()  # One timestamp for every row of this refresh
+
         with get_db_context() as db:
-            profile = db.query(Profile).filter(Profile.username == username).first()
-            if profile:
-                profile.is_active = False
-                db.commit()
-                logger.info(f"🗑️ Removed @{username} from watchlist")
-                return True
-        
-        return False
-    
+            # Only scalar columns are used; relationships are never loaded
+            profile = db.get(Profile, state.id)
+
+            profile.platform_user_id = platform_user_id  # Always update to latest secUid
+            profile.display_name = profile_data.display_name
+            profile.bio = profile_data.bio
+            profile.avatar_url = profile_data.avatar_url
+            profile.follower_count = profile_data.follower_count
+            profile.following_count = profile_data.following_count
+            profile.total_likes = profile_data.total_likes
+            profile.video_count = profile_data.video_count
+            profile.average_post_views = new_avg_views
+            profile.last_scraped_at = now
+            
+            # Create history snapshot (append-only log: Core insert)
+            db.execute(insert(ProfileHistory).values(
+                profile_id=profile.id,
+                follower_count=profile.follower_count,
+                following_count=profile.following_count,
+                total_likes=profile.total_likes,
+                video_count=profile.video_count,
+                follower_change=profile.follower_count - state.follower_count,
+                likes_change=profile.total_likes - state.total_likes,
+                recorded_at=now
+            ))
+            
+            # UPSERT posts and check for viral content (against the old average)
+            viral_posts = self._upsert_posts(db, profile.id, posts_data, state.average_post_views, now)
+            
+            db.commit()
+
+            # Load the committed row so the profile stays usable once detached
+            db.refresh(profile)
+            db.expunge(profile)
+
+            return profile, viral_posts
+
+    def _log_alert(
+        self,
+        post_id: int,
+        profile_id: int,
+        message: str,
+        success: bool,
+        error_message: Optional[str],
+        mark_sent: bool
+    ) -> None:
+        """Record an alert attempt and, if it went out, flag the post as alerted."""
+        with get_db_context() as db:
+            if mark_sent:
+                db.execute(update(Post).where(Post.id == post_id).values(viral_alert_sent=True))
+
+            # Append-only log: Core insert, no ORM object
+            db.execute(insert(AlertLog).values(
+                post_id=post_id,
+                profile_id=profile_id,
+                alert_type="viral_post",
+                message=message,
+                success=success,
+                error_message=error_message
+            ))
+
     # =========================================================================
     # PRIVATE HELPER METHODS
     # =========================================================================
@@ -576,24 +685,18 @@ class TikTokScraper(BaseScraper):
             logger.warning(f"⚠️  All {len(posts)} posts have 0 views - average will be 0")
             return 0.0
 
-        avg = mean(view_counts)
+        # Plain float division: statistics.mean() does exact rational
+        # arithmetic, which is much slower and not needed for a threshold
+        avg = sum(view_counts) / len(view_counts)
         logger.debug(f"📊 Average calculation: {len(view_counts)} posts with views, avg = {avg:,.0f}")
         return avg
     
-    def _create_post_record(
-        self,
-        profile_id: int,
-        post_data: TikTokPost,
-        avg_views: float
-    ) -> Post:
-        """Create a Post database record from TikTok post data."""
-        is_viral = post_data.view_count > (avg_views * self.viral_threshold)
-
-        post = Post(
+    def _post_values(self, profile_id: int, post_data: TikTokPost, is_viral: bool) -> dict:
+        """Column values for a new posts row from TikTok post data."""
+        return dict(
             profile_id=profile_id,
             platform='tiktok',  # Set platform for multi-platform support
             platform_post_id=post_data.post_id,  # Use platform_post_id for consistency
-            tiktok_post_id=post_data.post_id,  # Keep legacy column for backward compatibility
             description=post_data.description,
             video_url=post_data.video_url,
             thumbnail_url=post_data.thumbnail_url,
@@ -607,104 +710,154 @@ class TikTokScraper(BaseScraper):
             posted_at=post_data.posted_at
         )
 
-        logger.debug(f"   📝 Created post record: {post_data.post_id[:15]}... views={post_data.view_count:,}, viral={is_viral}")
-
-        return post
-    
-    async def _upsert_post(
+    def _upsert_posts(
         self,
         db,
         profile_id: int,
-        post_data: TikTokPost,
-        avg_views: float
-    ) -> tuple[bool, bool, Post]:
+        posts_data: list[TikTokPost],
+        avg_views: float,
+        now: datetime
+    ) -> list[tuple[TikTokPost, int]]:
         """
-        Insert or update a post record.
-        
+        Insert or update a batch of post records.
+
+        Existing rows are read with one SELECT and all posts are written with
+        one INSERT ... ON CONFLICT (platform_post_id, platform) DO UPDATE,
+        instead of a SELECT plus INSERT/UPDATE per post. Posts whose metrics
+        and viral flag are unchanged are left out of the write entirely.
+
+        Args:
+            now: Timestamp for the post history rows (taken once per refresh)
+
         Returns:
-            Tuple of (is_new, is_viral, post_record)
+            List of (post_data, post_id) for posts that need a viral alert
         """
-        is_viral = post_data.view_count > (avg_views * self.viral_threshold)
-        
-        # Check if post exists
-        existing = db.query(Post).filter(
-            Post.tiktok_post_id == post_data.post_id
-        ).first()
-        
-        if existing:
-            # Update existing post
-            old_views = existing.view_count
-            existing.view_count = post_data.view_count
-            existing.like_count = post_data.like_count
-            existing.comment_count = post_data.comment_count
-            existing.share_count = post_data.share_count
-            existing.updated_at = datetime.utcnow()
-            
-            # Check if newly viral (wasn't before, is now)
-            if is_viral and not existing.is_viral:
-                existing.is_viral = True
-            
+        # The same row can't be hit twice by one ON CONFLICT statement
+        posts_by_id = {p.post_id: p for p in posts_data}
+        if not posts_by_id:
+            return []
+
+        existing = {
+            row.platform_post_id: row
+            for row in db.execute(
+                select(
+                    Post.id, Post.platform_post_id,
+                    Post.view_count, Post.like_count, Post.comment_count, Post.share_count,
+                    Post.is_viral, Post.viral_alert_sent
+                )
+                .where(Post.platform == 'tiktok', Post.platform_post_id.in_(list(posts_by_id)))
+            )
+        }
+
+        rows = []
+        history_rows = []
+        alert_candidates = []
+        threshold = avg_views * self.viral_threshold
+        for post_data in posts_by_id.values():
+            is_viral = post_data.view_count > threshold
+
+            old = existing.get(post_data.post_id)
+            if old is None:
+                rows.append(self._post_values(profile_id, post_data, is_viral))
+                # New posts that are viral should trigger alert
+                if is_viral:
+                    alert_candidates.append(post_data)
+                continue
+
+            # Skip the UPDATE (and its WAL / index churn) for quiet posts
+            unchanged = (
+                (old.view_count, old.like_count, old.comment_count, old.share_count)
+                == (post_data.view_count, post_data.like_count, post_data.comment_count, post_data.share_count)
+            )
+            if not unchanged or (is_viral and not old.is_viral):
+                rows.append(self._post_values(profile_id, post_data, is_viral))
+
             # Only trigger alert if:
             # 1. Post is viral
             # 2. Alert hasn't been sent yet
-            should_alert = is_viral and not existing.viral_alert_sent
-            
+            if is_viral and not old.viral_alert_sent:
+                alert_candidates.append(post_data)
+
             # Add history record if views changed significantly (>10%)
+            old_views = old.view_count or 0
             if old_views > 0 and abs(post_data.view_count - old_views) / old_views > 0.1:
-                history = PostHistory(
-                    post_id=existing.id,
+                history_rows.append(dict(
+                    post_id=old.id,
                     view_count=post_data.view_count,
                     like_count=post_data.like_count,
                     comment_count=post_data.comment_count,
-                    share_count=post_data.share_count
-                )
-                db.add(history)
-            
-            return (False, should_alert, existing)
-        
-        else:
-            # Insert new post
-            post = self._create_post_record(profile_id, post_data, avg_views)
-            db.add(post)
-            db.flush()
-            
-            # New posts that are viral should trigger alert
-            return (True, is_viral, post)
+                    share_count=post_data.share_count,
+                    recorded_at=now
+                ))
+
+        # All history rows in one executemany
+        if history_rows:
+            db.execute(insert(PostHistory), history_rows)
+
+        post_ids = {post_id: old.id for post_id, old in existing.items()}
+        if not rows:
+            return [(post_data, post_ids[post_data.post_id]) for post_data in alert_candidates]
+
+        # Conflict target is uq_post_platform_id. Databases created with
+        # create_all() only have it once migration v0.0.9 has run.
+        stmt = pg_insert(Post.__table__).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['platform_post_id', 'platform'],
+            set_={
+                'view_count': stmt.excluded.view_count,
+                'like_count': stmt.excluded.like_count,
+                'comment_count': stmt.excluded.comment_count,
+                'share_count': stmt.excluded.share_count,
+                # Once viral, always viral
+                'is_viral': Post.__table__.c.is_viral | stmt.excluded.is_viral,
+            }
+        ).returning(Post.__table__.c.platform_post_id, Post.__table__.c.id)
+
+        post_ids.update(db.execute(stmt).all())
+
+        return [(post_data, post_ids[post_data.post_id]) for post_data in alert_candidates]
     
+    def _queue_viral_alerts(
+        self,
+        profile: Profile,
+        viral_posts: list[tuple[TikTokPost, int]],
+        avg_views: float
+    ) -> None:
+        """Hand viral alerts off to background tasks (sent MAX_CONCURRENT_ALERTS at a time)."""
+        for post_data, post_id in viral_posts:
+            self._spawn_alert(self._send_viral_alert(profile, post_data, post_id, avg_views))
+
     async def _send_viral_alert(
         self,
-        db,
         profile: Profile,
         post_data: TikTokPost,
-        post_record: Post,
+        post_id: int,
         avg_views: float
     ):
         """Send Telegram alert for viral post and log it."""
         try:
-            result = await self.telegram.send_viral_alert(
-                username=profile.username,
-                post_id=post_data.post_id,
-                views=post_data.view_count,
-                avg_views=avg_views,
-                description=post_data.description,
-                video_url=post_data.video_url
-            )
+            async with self._alert_sem:
+                result = await self.telegram.send_viral_alert(
+                    username=profile.username,
+                    post_id=post_data.post_id,
+                    views=post_data.view_count,
+                    avg_views=avg_views,
+                    description=post_data.description,
+                    video_url=post_data.video_url
+                )
             
             success = result.get("ok", False)
             
-            # Mark alert as sent
-            post_record.viral_alert_sent = True
-            
-            # Log the alert
-            alert_log = AlertLog(
-                post_id=post_record.id,
-                profile_id=profile.id,
-                alert_type="viral_post",
-                message=f"Viral alert for @{profile.username} - {post_data.view_count:,} views ({post_data.view_count/avg_views:.1f}x avg)",
-                success=success,
-                error_message=None if success else str(result.get("error"))
+            # Mark alert as sent and log it
+            await asyncio.to_thread(
+                self._log_alert,
+                post_id,
+                profile.id,
+                f"Viral alert for @{profile.username} - {post_data.view_count:,} views ({post_data.view_count/avg_views:.1f}x avg)",
+                success,
+                None if success else str(result.get("error")),
+                True
             )
-            db.add(alert_log)
             
             logger.info(f"🚀 Viral alert sent for @{profile.username} post {post_data.post_id}")
             
@@ -712,16 +865,15 @@ class TikTokScraper(BaseScraper):
             logger.error(f"Failed to send viral alert: {e}")
             
             # Log failed alert
-            alert_log = AlertLog(
-                post_id=post_record.id,
-                profile_id=profile.id,
-                alert_type="viral_post",
-                message=f"Failed viral alert for @{profile.username}",
-                success=False,
-                error_message=str(e)
+            await asyncio.to_thread(
+                self._log_alert,
+                post_id,
+                profile.id,
+                f"Failed viral alert for @{profile.username}",
+                False,
+                str(e),
+                False
             )
-            db.add(alert_log)
-
 
 # =============================================================================
 # TWITTER SCRAPER (Stub for Future Implementation)
@@ -750,7 +902,7 @@ class TwitterScraper(BaseScraper):
     async def update_profile(self, username: str) -> Optional[Profile]:
         raise NotImplementedError("Twitter scraper not yet implemented.")
 
-    async def update_profile_by_id(self, profile_id: int) -> Optional[Profile]:
+    async def update_profile_by_id(self, profile_id: int, state=None) -> Optional[Profile]:
         raise NotImplementedError("Twitter scraper not yet implemented.")
 
 
@@ -782,7 +934,7 @@ class RedditScraper(BaseScraper):
     async def update_profile(self, username: str) -> Optional[Profile]:
         raise NotImplementedError("Reddit scraper not yet implemented.")
 
-    async def update_profile_by_id(self, profile_id: int) -> Optional[Profile]:
+    async def update_profile_by_id(self, profile_id: int, state=None) -> Optional[Profile]:
         raise NotImplementedError("Reddit scraper not yet implemented.")
 
 
@@ -798,6 +950,10 @@ class ScraperFactory:
         scraper = ScraperFactory.get_scraper('tiktok')
         profile = await scraper.add_profile('username')
 
+    Scrapers are created once per platform and then reused, so their HTTP
+    connection pools (keep-alive, TLS sessions) carry over between calls.
+    Call ScraperFactory.aclose() before exiting to release the sockets.
+
     Supported platforms:
         - 'tiktok': TikTokScraper (fully implemented)
         - 'twitter': TwitterScraper (stub)
@@ -810,6 +966,9 @@ class ScraperFactory:
         'reddit': RedditScraper,
     }
 
+    # Shared scraper instance per platform, created on first request
+    _instances: dict[str, BaseScraper] = {}
+
     @classmethod
     def get_scraper(cls, platform: str) -> BaseScraper:
         """
@@ -819,22 +978,45 @@ class ScraperFactory:
             platform: Platform identifier ('tiktok', 'twitter', 'reddit')
 
         Returns:
-            Platform-specific scraper instance
+            Platform-specific scraper instance (shared per platform)
 
         Raises:
             ValueError: If platform is not supported
         """
+        return cls._resolve(platform)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _resolve(platform: str) -> BaseScraper:
+        """
+        Normalize, validate and look up a platform string.
+
+        Memoised on the raw string, so repeat calls (once per convenience
+        call, once per platform in a bulk update) are a single cache hit.
+        Unsupported platforms raise and are therefore never cached.
+        """
         platform = platform.lower().strip()
 
-        if platform not in cls._scrapers:
-            supported = ', '.join(cls._scrapers.keys())
+        if platform not in ScraperFactory._scrapers:
+            supported = ', '.join(ScraperFactory._scrapers.keys())
             raise ValueError(
                 f"Unsupported platform: '{platform}'. "
                 f"Supported platforms: {supported}"
             )
 
-        scraper_class = cls._scrapers[platform]
-        return scraper_class()
+        instances = ScraperFactory._instances
+        if platform not in instances:
+            instances[platform] = ScraperFactory._scrapers[platform]()
+        return instances[platform]
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close every cached scraper and forget it."""
+        instances = list(cls._instances.values())
+        cls._instances.clear()
+        cls._resolve.cache_clear()
+        for scraper in instances:
+            await scraper.aclose()
 
     @classmethod
     def get_supported_platforms(cls) -> list[str]:
@@ -873,7 +1055,9 @@ async def update_profile(username: str, platform: str = 'tiktok') -> Optional[Pr
         Updated Profile object or None if not found
     """
     scraper = ScraperFactory.get_scraper(platform)
-    return await scraper.update_profile(username)
+    profile = await scraper.update_profile(username)
+    await scraper.flush_alerts()
+    return profile
 
 
 async def update_all_profiles() -> dict:
@@ -885,18 +1069,34 @@ async def update_all_profiles() -> dict:
     """
     logger.info("🔄 Starting bulk update for all profiles (multi-platform)...")
 
-    # Get all active profiles grouped by platform
+    # Get all active profiles with the state each refresh needs, in one
+    # SELECT (plain rows, no ORM objects). The database sorts by platform
+    # (legacy NULL records count as tiktok), so grouping is a single pass,
+    # and rows stream from a server-side cursor in chunks of
+    # PROFILE_FETCH_CHUNK instead of being buffered as one list first.
+    platform_col = func.coalesce(Profile.platform, 'tiktok').label('platform')
     with get_db_context() as db:
-        profiles = db.query(Profile).filter(Profile.is_active == True).all()
-        platform_profiles = {}
-        for p in profiles:
-            platform = p.platform or 'tiktok'  # Default to tiktok for legacy records
-            if platform not in platform_profiles:
-                platform_profiles[platform] = []
-            platform_profiles[platform].append((p.id, p.username))
+        rows = db.execute(
+            select(platform_col, *PROFILE_STATE_COLUMNS)
+            .where(Profile.is_active.is_(True))
+            .order_by(platform_col)
+            .execution_options(yield_per=PROFILE_FETCH_CHUNK)
+        )
+        platform_profiles = {
+            platform: list(group)
+            for platform, group in itertools.groupby(rows, key=lambda row: row.platform)
+        }
 
     results = {"success": 0, "failed": 0, "by_platform": {}}
 
+    # Updates are network-bound, so overlap them up to the concurrency cap
+    sem = asyncio.Semaphore(config.MAX_CONCURRENT_UPDATES)
+
+    async def _one(scraper, state):
+        async with sem:
+            await scraper.rate_limiter.acquire()
+            await scraper.update_profile_by_id(state.id, state)
+
     # Update each platform separately
     for platform, profile_list in platform_profiles.items():
         logger.info(f"📊 Updating {len(profile_list)} {platform} profiles...")
@@ -910,22 +1110,24 @@ async def update_all_profiles() -> dict:
             results["by_platform"][platform]["failed"] = len(profile_list)
             continue
 
-        for profile_id, username in profile_list:
-            try:
-                await scraper.update_profile_by_id(profile_id)
-                results["success"] += 1
-                results["by_platform"][platform]["success"] += 1
-            except NotImplementedError:
-                logger.warning(f"Skipping {platform} profile @{username} (not implemented)")
+        outcomes = await asyncio.gather(
+            *[_one(scraper, state) for state in profile_list],
+            return_exceptions=True
+        )
+        await scraper.flush_alerts()
+
+        for state, outcome in zip(profile_list, outcomes):
+            if isinstance(outcome, NotImplementedError):
+                logger.warning(f"Skipping {platform} profile @{state.username} (not implemented)")
                 results["failed"] += 1
                 results["by_platform"][platform]["failed"] += 1
-            except Exception as e:
-                logger.error(f"Failed to update @{username} ({platform}): {e}")
+            elif isinstance(outcome, Exception):
+                logger.error(f"Failed to update @{state.username} ({platform}): {outcome}")
                 results["failed"] += 1
                 results["by_platform"][platform]["failed"] += 1
-
-            # Rate limiting - wait between requests
-            await asyncio.sleep(2)
+            else:
+                results["success"] += 1
+                results["by_platform"][platform]["success"] += 1
 
     logger.info(
         f"✅ Bulk update complete: "
@@ -957,7 +1159,7 @@ async def remove_profile(username: str, platform: str = 'tiktok') -> bool:
 if __name__ == "__main__":
     import sys
 
-    async def main():
+    async def run_command():
         if len(sys.argv) < 2:
             supported = ', '.join(ScraperFactory.get_supported_platforms())
             print("Usage: python scraper.py <command> [args]")
@@ -993,4 +1195,10 @@ if __name__ == "__main__":
         else:
             print(f"Unknown command: {command}")
 
+    async def main():
+        try:
+            await run_command()
+        finally:
+            await ScraperFactory.aclose()
+
     asyncio.run(main())
@@ -543,6 +543,9 @@ def upsert_traffic_data(subreddit_name: str, traffic_data: list[dict]) -> int:
     """
     Upsert traffic data into the database using ON CONFLICT pattern.
 
+    All records go out as one multi-row INSERT ... ON CONFLICT DO UPDATE,
+    so a sync costs a single round-trip regardless of how many days it covers.
+
     Args:
         subreddit_name: Name of the subreddit
         traffic_data: List of traffic records
@@ -550,52 +553,52 @@ def upsert_traffic_data(subreddit_name: str, traffic_data: list[dict]) -> int:
     Returns:
         Number of records upserted
     """
-    from sqlalchemy import create_engine, text
-    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.dialects.postgresql import insert
 
-    database_url = get_database_url()
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    from database.engine import get_engine
+    from database.models import SubredditTraffic
 
-    upserted_count = 0
+    # ON CONFLICT DO UPDATE rejects a batch that touches the same row twice,
+    # so keep only the last record seen for each day
+    rows_by_date = {}
+    for record in traffic_data:
+        day = record["timestamp"].date()
+        rows_by_date[day] = {
+            "subreddit_name": subreddit_name,
+            "timestamp": day,
+            "unique_visitors": record["unique_visitors"],
+            "pageviews": record["pageviews"],
+            "subscriptions": record["subscriptions"],
+        }
+
+    if not rows_by_date:
+        return 0
+
+    stmt = insert(SubredditTraffic).values(list(rows_by_date.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["subreddit_name", "timestamp"],
+        set_={
+            "unique_visitors": stmt.excluded.unique_visitors,
+            "pageviews": stmt.excluded.pageviews,
+            "subscriptions": stmt.excluded.subscriptions,
+        },
+    )
+
+    # Process-wide engine: repeated syncs reuse its pool instead of
+    # reconnecting (and it is never disposed here)
+    engine = get_engine(get_database_url())
 
     try:
-        for record in traffic_data:
-            # Use PostgreSQL upsert (INSERT ... ON CONFLICT)
-            session.execute(
-                text("""
-                    INSERT INTO subreddit_traffic
-                        (subreddit_name, timestamp, unique_visitors, pageviews, subscriptions, created_at, updated_at)
-                    VALUES
-                        (:subreddit_name, :timestamp, :unique_visitors, :pageviews, :subscriptions, NOW(), NOW())
-                    ON CONFLICT (subreddit_name, timestamp)
-                    DO UPDATE SET
-                        unique_visitors = EXCLUDED.unique_visitors,
-                        pageviews = EXCLUDED.pageviews,
-                        subscriptions = EXCLUDED.subscriptions,
-                        updated_at = NOW()
-                """),
-                {
-                    "subreddit_name": subreddit_name,
-                    "timestamp": record["timestamp"],
-                    "unique_visitors": record["unique_visitors"],
-                    "pageviews": record["pageviews"],
-                    "subscriptions": record["subscriptions"],
-                },
-            )
-            upserted_count += 1
+        with engine.begin() as conn:
+            conn.execute(stmt)
 
-        session.commit()
+        upserted_count = len(rows_by_date)
         logger.info(f"Upserted {upserted_count} traffic records to database")
         return upserted_count
 
     except Exception as e:
-        session.rollback()
         logger.error(f"Database error during upsert: {e}")
         raise
-    finally:
-        session.close()
 
 
 # =============================================================================
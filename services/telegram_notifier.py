@@ -3,6 +3,7 @@ Pulse - TikTok Analytics Dashboard
 Telegram Bot Integration for Viral Alerts
 """
 
+import asyncio
 import httpx
 import logging
 from typing import Optional
@@ -28,7 +29,26 @@ class TelegramNotifier:
         self.bot_token = bot_token or config.TELEGRAM_BOT_TOKEN
         self.chat_id = chat_id or config.TELEGRAM_CHAT_ID
         self.api_url = self.BASE_URL.format(token=self.bot_token)
-        
+
+        # Reused across messages so alerts don't each pay a TLS handshake
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the HTTP client for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient()
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and release its sockets."""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
     async def send_message(self, text: str, parse_mode: str = "HTML") -> dict:
         """
         Send a message to the configured Telegram chat.
@@ -49,22 +69,22 @@ class TelegramNotifier:
             "disable_web_page_preview": False
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(endpoint, json=payload, timeout=30.0)
-                response.raise_for_status()
-                result = response.json()
-                
-                if result.get("ok"):
-                    logger.info(f"✅ Telegram message sent successfully")
-                else:
-                    logger.error(f"❌ Telegram API error: {result}")
-                    
-                return result
+        client = self._get_client()
+        try:
+            response = await client.post(endpoint, json=payload, timeout=30.0)
+            response.raise_for_status()
+            result = response.json()
+            
+            if result.get("ok"):
+                logger.info(f"✅ Telegram message sent successfully")
+            else:
+                logger.error(f"❌ Telegram API error: {result}")
                 
-            except httpx.HTTPError as e:
-                logger.error(f"❌ Failed to send Telegram message: {e}")
-                return {"ok": False, "error": str(e)}
+            return result
+            
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Failed to send Telegram message: {e}")
+            return {"ok": False, "error": str(e)}
     
     async def send_viral_alert(
         self,
@@ -7,7 +7,8 @@ Updated for tiktok-api23 API endpoints:
 - /api/user/posts - Fetch user's videos with engagement stats
 
 Features:
-- Mandatory 2.0s pre-request delay for rate limit compliance
+- Minimum 2.0s spacing between requests (API_MIN_REQUEST_INTERVAL),
+  stretched further when the rate-limit headers report a low quota
 - Automatic retry with generous backoff for 429 rate limits: 5s → 10s → 20s
 - Global asyncio.Lock to prevent concurrent API calls across processes
 - Rate limit header logging (X-RateLimit-Reset, Retry-After)
@@ -21,6 +22,7 @@ Host: tiktok-api23.p.rapidapi.com
 import httpx
 import logging
 import asyncio
+import time
 from typing import Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -33,6 +35,101 @@ logger = logging.getLogger(__name__)
 # This ensures web and worker processes don't hit the API simultaneously
 _global_api_lock = asyncio.Lock()
 
+# Below this many remaining requests, calls are spread over the rest of the window
+RATE_LIMIT_LOW_WATERMARK = 5
+
+# Wait when the quota is spent but the API didn't say when it resets
+QUOTA_EXHAUSTED_WAIT = 5.0
+
+# Header names, RapidAPI's first, then the common generic ones
+REMAINING_HEADERS = ("X-RateLimit-Requests-Remaining", "X-RateLimit-Remaining")
+RESET_HEADERS = ("X-RateLimit-Requests-Reset", "X-RateLimit-Reset")
+
+
+class AdaptiveLimiter:
+    """
+    Per-host request pacing driven by rate-limit response headers.
+
+    Requests to a host are always at least min_interval apart - RapidAPI's
+    remaining-quota header counts the whole plan period, so a healthy quota
+    says nothing about bursts. On top of that floor, once the reported quota
+    drops to RATE_LIMIT_LOW_WATERMARK the remaining requests are spread
+    evenly until the window resets, and at zero the next request waits for
+    the reset (QUOTA_EXHAUSTED_WAIT if the reset time wasn't reported).
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        # host -> (remaining, reset_at on the time.monotonic() clock, or None
+        # when the response didn't say)
+        self._quota: dict[str, tuple[int, Optional[float]]] = {}
+        self._last_request: dict[str, float] = {}
+
+    def delay(self, host: str) -> float:
+        """Seconds to wait before the next request to host."""
+        now = time.monotonic()
+
+        last = self._last_request.get(host)
+        floor = 0.0 if last is None else last + self.min_interval - now
+
+        return max(0.0, floor, self._quota_delay(host, now))
+
+    def _quota_delay(self, host: str, now: float) -> float:
+        """Extra wait demanded by the last reported quota (0 if comfortable)."""
+        if host not in self._quota:
+            return 0.0
+
+        remaining, reset_at = self._quota[host]
+        if remaining > RATE_LIMIT_LOW_WATERMARK:
+            return 0.0
+        if reset_at is None:
+            return QUOTA_EXHAUSTED_WAIT if remaining <= 0 else 0.0
+        if reset_at <= now:
+            return 0.0
+        if remaining <= 0:
+            return reset_at - now
+        return (reset_at - now) / remaining
+
+    async def acquire(self, host: str) -> None:
+        """Wait until a request to host fits the current budget."""
+        wait = self.delay(host)
+        if wait > 0:
+            logger.debug(f"⏱️  Throttling {host}: sleeping {wait:.1f}s")
+            await asyncio.sleep(wait)
+        self._last_request[host] = time.monotonic()
+
+    def update_from_headers(self, host: str, headers) -> None:
+        """Record the quota reported by a response (no-op without headers)."""
+        remaining = _header_number(headers, REMAINING_HEADERS)
+        if remaining is None:
+            return
+
+        reset = _header_number(headers, RESET_HEADERS)
+        reset_at = None
+        if reset is not None:
+            if reset > 1_000_000_000:
+                # Epoch timestamp rather than seconds-until-reset
+                reset -= time.time()
+            reset_at = time.monotonic() + max(reset, 0.0)
+        self._quota[host] = (int(remaining), reset_at)
+
+
+def _header_number(headers, names: tuple) -> Optional[float]:
+    """First of the named headers that parses as a number."""
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+# Shared like _global_api_lock, so every client instance sees the same quota
+_rate_limiter = AdaptiveLimiter(config.API_MIN_REQUEST_INTERVAL)
+
 
 class RateLimitError(Exception):
     """Exception for rate limit errors after all retries exhausted."""
@@ -82,7 +179,7 @@ class TikTokClient:
     API Configuration:
         - Host: tiktok-api23.p.rapidapi.com (set via RAPIDAPI_HOST env var)
         - Endpoints: /api/user/info, /api/user/posts
-        - Rate Limiting: 2.0s pre-request delay + exponential backoff
+        - Rate Limiting: header-driven adaptive delay + exponential backoff
 
     Usage:
         client = TikTokClient()
@@ -116,6 +213,32 @@ class TikTokClient:
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": self.api_host
         }
+
+        # Shared connection pool (keep-alive, TLS sessions), see _get_client()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Return the HTTP client, creating it on first use.
+
+        Every request reuses its pooled connections instead of paying a new
+        TCP + TLS handshake. A client is tied to the event loop it was opened
+        on, so callers that run each call in a fresh loop (the dashboard) get
+        a new one per loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient()
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and release its sockets."""
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
     
     async def _make_request(
         self,
@@ -128,9 +251,10 @@ class TikTokClient:
         Make authenticated request to RapidAPI with comprehensive rate limiting.
 
         IMPORTANT: ScrapTik Basic Plan Rate Limit Strategy:
-        1. Mandatory 2.0s delay BEFORE each request (prevents bursts)
+        1. Delay BEFORE each request (AdaptiveLimiter): at least 2.0s
+           apart, longer when the reported quota runs low
         2. Global asyncio.Lock (prevents concurrent requests)
-        3. Generous retry backoff: 5s → 10s → 20s (allows API gateway reset)
+        3. Generous retry backoff: Retry-After (or 5s), doubled per attempt
         4. Rate limit header logging (X-RateLimit-Reset, Retry-After)
 
         Args:
@@ -150,91 +274,92 @@ class TikTokClient:
 
         # Acquire global lock to prevent concurrent API calls
         async with _global_api_lock:
-            # MANDATORY PRE-REQUEST DELAY: Ensures 1 request per 2 seconds minimum
-            # This prevents bursting and stays well within Basic plan limits
-            logger.debug(f"⏱️  Pre-request throttle: Sleeping 2.0s before {endpoint}")
-            await asyncio.sleep(2.0)
-
             for attempt in range(max_retries + 1):
-                async with httpx.AsyncClient() as client:
-                    try:
-                        response = await client.get(
-                            url,
-                            headers=self.headers,
-                            params=params,
-                            timeout=timeout
-                        )
-
-                        logger.debug(f"API Request: {url} | Status: {response.status_code}")
-
-                        # Handle 202 with validation errors (tiktok-api23 specific)
-                        if response.status_code == 202:
-                            # tiktok-api23 returns 202 for validation errors
-                            try:
-                                response_data = response.json()
-                                success = response_data.get("success", True)
-
-                                if not success:
-                                    error_msg = response_data.get("error", response_data.get("message", "Unknown validation error"))
-                                    logger.error(f"❌ API validation error (202): {error_msg}")
-                                    logger.debug(f"Full response: {response_data}")
-                                    raise TikTokAPIError(f"API validation error: {error_msg}")
-                            except ValueError:
-                                # Can't parse JSON, treat as error
-                                raise TikTokAPIError(f"Unexpected 202 response: {response.text}")
-
-                        # Handle 429 Rate Limit with generous backoff
-                        if response.status_code == 429:
-                            # Log rate limit headers if available
-                            retry_after = response.headers.get('Retry-After')
-                            reset_time = response.headers.get('X-RateLimit-Reset')
-
-                            if retry_after:
-                                logger.warning(f"🚫 Rate limit response header: Retry-After = {retry_after}s")
-                            if reset_time:
-                                logger.warning(f"🚫 Rate limit response header: X-RateLimit-Reset = {reset_time}")
-
-                            if attempt < max_retries:
-                                # Generous backoff: 5s, 10s, 20s (gives API gateway time to reset)
-                                backoff_seconds = 5 * (2 ** attempt)  # 5, 10, 20
-                                logger.warning(
-                                    f"⚠️  Rate limit hit on {endpoint} "
-                                    f"(attempt {attempt + 1}/{max_retries + 1}). "
-                                    f"Retrying in {backoff_seconds}s to allow API gateway reset..."
-                                )
-                                await asyncio.sleep(backoff_seconds)
-                                continue
-                            else:
-                                logger.error(
-                                    f"❌ Rate limit exhausted after {max_retries + 1} attempts on {endpoint}"
-                                )
-                                raise RateLimitError(
-                                    f"Rate limit exceeded after {max_retries + 1} attempts. "
-                                    f"Please wait before making more requests."
-                                )
-
-                        # Handle other error codes
-                        if response.status_code == 404:
-                            raise TikTokAPIError(f"Endpoint not found: {endpoint}")
-
-                        if response.status_code == 401:
-                            raise TikTokAPIError("Invalid API key. Check your RAPIDAPI_KEY.")
-
-                        if response.status_code != 200:
-                            raise TikTokAPIError(
-                                f"API request failed with status {response.status_code}: {response.text}"
+                # PRE-REQUEST THROTTLE: only sleeps when the quota runs low
+                await _rate_limiter.acquire(self.api_host)
+
+                client = self._get_client()
+                try:
+                    response = await client.get(
+                        url,
+                        headers=self.headers,
+                        params=params,
+                        timeout=timeout
+                    )
+                    _rate_limiter.update_from_headers(self.api_host, response.headers)
+
+                    logger.debug(f"API Request: {url} | Status: {response.status_code}")
+
+                    # Handle 202 with validation errors (tiktok-api23 specific)
+                    if response.status_code == 202:
+                        # tiktok-api23 returns 202 for validation errors
+                        try:
+                            response_data = response.json()
+                            success = response_data.get("success", True)
+
+                            if not success:
+                                error_msg = response_data.get("error", response_data.get("message", "Unknown validation error"))
+                                logger.error(f"❌ API validation error (202): {error_msg}")
+                                logger.debug(f"Full response: {response_data}")
+                                raise TikTokAPIError(f"API validation error: {error_msg}")
+                        except ValueError:
+                            # Can't parse JSON, treat as error
+                            raise TikTokAPIError(f"Unexpected 202 response: {response.text}")
+
+                    # Handle 429 Rate Limit with generous backoff
+                    if response.status_code == 429:
+                        # Log rate limit headers if available
+                        retry_after = response.headers.get('Retry-After')
+                        reset_time = response.headers.get('X-RateLimit-Reset')
+
+                        if retry_after:
+                            logger.warning(f"🚫 Rate limit response header: Retry-After = {retry_after}s")
+                        if reset_time:
+                            logger.warning(f"🚫 Rate limit response header: X-RateLimit-Reset = {reset_time}")
+
+                        if attempt < max_retries:
+                            # Honour Retry-After when sent (doubling per attempt),
+                            # else generous backoff: 5s, 10s, 20s
+                            retry_base = _header_number(response.headers, ("Retry-After",))
+                            backoff_seconds = (retry_base or 5) * (2 ** attempt)
+                            logger.warning(
+                                f"⚠️  Rate limit hit on {endpoint} "
+                                f"(attempt {attempt + 1}/{max_retries + 1}). "
+                                f"Retrying in {backoff_seconds}s to allow API gateway reset..."
                             )
+                            await asyncio.sleep(backoff_seconds)
+                            continue
+                        else:
+                            logger.error(
+                                f"❌ Rate limit exhausted after {max_retries + 1} attempts on {endpoint}"
+                            )
+                            raise RateLimitError(
+                                f"Rate limit exceeded after {max_retries + 1} attempts. "
+                                f"Please wait before making more requests."
+                            )
+
+                    # Handle other error codes
+                    if response.status_code == 404:
+                        raise TikTokAPIError(f"Endpoint not found: {endpoint}")
+
+                    if response.status_code == 401:
+                        raise TikTokAPIError("Invalid API key. Check your RAPIDAPI_KEY.")
+
+                    if response.status_code != 200:
+                        raise TikTokAPIError(
+                            f"API request failed with status {response.status_code}: {response.text}"
+                        )
 
-                        # Success - log if this was a retry
-                        if attempt > 0:
-                            logger.info(f"✅ Request succeeded after {attempt + 1} attempts")
+                    # Success - log if this was a retry
+                    if attempt > 0:
+                        logger.info(f"✅ Request succeeded after {attempt + 1} attempts")
 
-                        return response.json()
+                    return response.json()
 
-                    except httpx.TimeoutException:
-                        raise TikTokAPIError(f"Request timeout for {endpoint}")
-                    except httpx.HTTPError as e:
-                        raise TikTokAPIError(f"HTTP error: {str(e)}")
+                except httpx.TimeoutException:
+                    raise TikTokAPIError(f"Request timeout for {endpoint}")
+                except httpx.HTTPError as e:
+                    raise TikTokAPIError(f"HTTP error: {str(e)}")
 
             # Should never reach here due to loop logic, but added for safety
             raise RateLimitError(f"Unexpected retry loop exit on {endpoint}")
@@ -28,7 +28,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from config import config
 from database.connection import init_database, check_schema_health
-from scraper import update_all_profiles
+from scraper import ScraperFactory, update_all_profiles
 from services.telegram_notifier import TelegramNotifier
 from services.logger import get_logger, setup_root_logger
 
@@ -145,6 +145,10 @@ class PulseWorker:
             )
         except:
             pass
+
+        # Release the shared HTTP connection pools
+        await ScraperFactory.aclose()
+        await self.telegram.aclose()
         
         logger.info("Pulse Worker stopped")
     